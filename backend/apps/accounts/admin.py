@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR
+from apps.accounts.managers.user_search import order_users, search_users
 from apps.accounts.models import Usuario
 
 
@@ -6,4 +8,13 @@ from apps.accounts.models import Usuario
 class UsuarioAdmin(admin.ModelAdmin):
     list_display = ('id', 'username', 'email', 'is_active', 'avatar')
     search_fields = ('username', 'email')
+    search_help_text = 'Username ou e-mail.'
     list_filter = ('is_active',)
+
+    def get_search_results(self, request, queryset, search_term):
+        # busca indexada (trigram/prefixo) em vez de icontains por palavra
+        queryset = search_users(queryset, search_term)
+        if ORDER_VAR not in request.GET:
+            # sem ordenação escolhida na tela: mais relevantes primeiro
+            queryset = order_users(queryset)
+        return queryset, False
@@ -0,0 +1,256 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import aauthenticate, get_user_model
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.accounts.apis.google_oauth import GoogleAuthAPIView
+from apps.accounts.apis.serializers import LoginSerializer, UserSerializer
+from apps.accounts.apis.viewsets import LoginAPIView, MeAPIView, UserDetailAPIView, UserListAPIView, filter_users, get_tokens_for_user # noqa E501
+from apps.accounts.managers.google_keys import verify_google_id_token
+from apps.accounts.managers.google_users import get_or_create_google_user
+from apps.accounts.managers.lean_users import lean_rows, serialize_users
+from apps.accounts.managers.user_cache import acache_entry, aget_cached_entry, auser_entry, conditional_response # noqa E501
+from apps.accounts.managers.user_search import order_users
+from core.db_router import replica_reads
+
+User = get_user_model()
+
+
+def schema_from(sync_handler):
+    """Reaproveita o `swagger_auto_schema` do handler síncrono."""
+    def decorator(handler):
+        schema = getattr(sync_handler, "_swagger_auto_schema", None)
+        if schema is not None:
+            handler._swagger_auto_schema = schema
+        return handler
+    return decorator
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView com handlers `async def`, atendida direto no event loop
+    quando servida via ASGI (`core/asgi.py`).
+
+    Negociação, permissões, exceções e renderização continuam sendo as do
+    DRF; só a autenticação é aguardada (`aauthenticate` do autenticador,
+    se existir) para não consultar cache/banco de forma síncrona.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            method = request.method.lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, "aauthenticate", None)
+            if authenticate is None:
+                authenticate = sync_to_async(authenticator.authenticate)
+            try:
+                user_auth = await authenticate(request)
+            except APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+
+        request._not_authenticated()
+
+
+class AsyncLoginAPIView(AsyncAPIView, LoginAPIView):
+    @schema_from(LoginAPIView.post)
+    async def post(self, request, *args, **kwargs):
+        serializer = LoginSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {"errors": "E-mail e senha são obrigatórios."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        email = serializer.validated_data.get("email")
+        password = serializer.validated_data.get("password")
+
+        # o hash da senha roda no pool de processos, sem travar o loop
+        user = await aauthenticate(request, email=email, password=password)
+
+        if user is None:
+            return Response(
+                {"errors": "Credenciais inválidas."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        tokens = await sync_to_async(get_tokens_for_user)(user)
+        response_serializer = UserSerializer(user)
+
+        return Response(
+            {
+                "message": "Login bem-sucedido!",
+                "user": response_serializer.data,
+                "tokens": tokens,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class AsyncUserListAPIView(AsyncAPIView, UserListAPIView):
+    @schema_from(UserListAPIView.get)
+    @replica_reads
+    async def get(self, request, *args, **kwargs):
+        qs = lean_rows(
+            order_users(filter_users(request, User.objects.all()))
+        )
+
+        paginator_class = self.get_paginator_class(request)
+        if paginator_class is None:
+            return Response(serialize_users([u async for u in qs]))
+
+        paginator = paginator_class()
+        if issubclass(paginator_class, LimitOffsetPagination):
+            page = await self.apaginate_offset(paginator, qs, request)
+        else:
+            # cursor: uma única query por página, mas a lógica de
+            # montagem do cursor do DRF é síncrona
+            page = await sync_to_async(paginator.paginate_queryset)(
+                qs, request, view=self
+            )
+
+        if page is None:
+            return Response(serialize_users([u async for u in qs]))
+
+        return paginator.get_paginated_response(serialize_users(page))
+
+    async def apaginate_offset(self, paginator, qs, request):
+        """`LimitOffsetPagination.paginate_queryset` com o ORM async."""
+        paginator.request = request
+        paginator.limit = paginator.get_limit(request)
+        if paginator.limit is None:
+            return None
+
+        paginator.offset = paginator.get_offset(request)
+        # get_count pode ler UserCounters em vez de fazer COUNT(*)
+        paginator.count = await sync_to_async(paginator.get_count)(qs)
+        if paginator.count == 0 or paginator.offset > paginator.count:
+            return []
+        end = paginator.offset + paginator.limit
+        return [u async for u in qs[paginator.offset:end]]
+
+
+class AsyncUserDetailAPIView(AsyncAPIView, UserDetailAPIView):
+    @schema_from(UserDetailAPIView.get)
+    @replica_reads
+    async def get(self, request, user_id, *args, **kwargs):
+        entry = await auser_entry(user_id)
+        if entry is None:
+            return Response(
+                {"error": "Usuário não encontrado."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return conditional_response(request, entry)
+
+    @schema_from(UserDetailAPIView.delete)
+    async def delete(self, request, user_id, *args, **kwargs):
+        try:
+            user = await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            return Response(
+                {"error": "Usuário não encontrado."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        await user.adelete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncMeAPIView(AsyncAPIView, MeAPIView):
+    @schema_from(MeAPIView.get)
+    @replica_reads
+    async def get(self, request, *args, **kwargs):
+        entry = await aget_cached_entry(request.user.id)
+        if entry is None:
+            entry = await acache_entry(request.user)
+        return conditional_response(request, entry)
+
+
+class AsyncGoogleAuthAPIView(AsyncAPIView, GoogleAuthAPIView):
+    async def post(self, request, *args, **kwargs):
+        token = request.data.get("token")
+        if not token:
+            raise ValidationError(
+                {"token": ["Token do Google é obrigatório."]}
+            )
+
+        # a verificação pode buscar os certificados na rede: roda fora do
+        # loop, sem ocupar a thread compartilhada do ORM
+        verify = sync_to_async(verify_google_id_token, thread_sensitive=False)
+        try:
+            idinfo = await verify(token, settings.GOOGLE_CLIENT_ID)
+        except Exception:
+            return Response(
+                {"detail": "Token do Google inválido."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        email = idinfo.get("email")
+        if not email:
+            return Response(
+                {"detail": "Google não retornou email."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user, _ = await sync_to_async(get_or_create_google_user)(email)
+
+        tokens = await sync_to_async(get_tokens_for_user)(user)
+
+        return Response(
+            {
+                "message": "Login com Google realizado com sucesso!",
+                "user": UserSerializer(user).data,
+                "tokens": tokens,
+            },
+            status=status.HTTP_200_OK,
+        )
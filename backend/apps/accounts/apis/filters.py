@@ -0,0 +1,25 @@
+from django_filters import rest_framework as filters
+from apps.accounts.managers.user_search import search_users
+from apps.accounts.models import Usuario
+
+
+class UserFilter(filters.FilterSet):
+    q = filters.CharFilter(method="filter_q")
+    username = filters.CharFilter(lookup_expr="istartswith")
+    email = filters.CharFilter(lookup_expr="istartswith")
+    joined_after = filters.IsoDateTimeFilter(
+        field_name="date_joined", lookup_expr="gte"
+    )
+    joined_before = filters.IsoDateTimeFilter(
+        field_name="date_joined", lookup_expr="lt"
+    )
+
+    class Meta:
+        model = Usuario
+        fields = [
+            "q", "username", "email", "is_active", "is_superuser",
+            "joined_after", "joined_before",
+        ]
+
+    def filter_q(self, queryset, name, value):
+        return search_users(queryset, value)
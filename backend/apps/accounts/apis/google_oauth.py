@@ -1,20 +1,19 @@
 from django.conf import settings
-from django.contrib.auth import get_user_model
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.tokens import RefreshToken
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from apps.accounts.tokens import UserRefreshToken
 from apps.accounts.apis.serializers import UserSerializer
-
-User = get_user_model()
+from apps.accounts.managers.google_keys import verify_google_id_token
+from apps.accounts.managers.google_users import get_or_create_google_user
+from apps.accounts.managers.throttling import GoogleAuthThrottle
 
 
 class GoogleAuthAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [GoogleAuthThrottle]
     http_method_names = ["post"]
 
     def post(self, request, *args, **kwargs):
@@ -25,11 +24,7 @@ class GoogleAuthAPIView(APIView):
             )
 
         try:
-            idinfo = id_token.verify_oauth2_token(
-                token,
-                requests.Request(),
-                settings.GOOGLE_CLIENT_ID,
-            )
+            idinfo = verify_google_id_token(token, settings.GOOGLE_CLIENT_ID)
         except Exception:
             return Response(
                 {"detail": "Token do Google inválido."},
@@ -43,12 +38,9 @@ class GoogleAuthAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user, _ = User.objects.get_or_create(
-            email=email,
-            defaults={"username": email.split("@")[0]},
-        )
+        user, _ = get_or_create_google_user(email)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         return Response(
             {
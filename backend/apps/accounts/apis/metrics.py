@@ -0,0 +1,20 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from apps.accounts.managers.hashing import hashing_pool
+from apps.accounts.managers.metrics import request_metrics
+from apps.accounts.managers.permissions import IsSuperUserOrInternalIP
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsAPIView(APIView):
+    permission_classes = [IsSuperUserOrInternalIP]
+    http_method_names = ["get"]
+
+    @swagger_auto_schema(auto_schema=None)
+    def get(self, request, *args, **kwargs):
+        body = request_metrics.render(
+            extra={"password_hashing": hashing_pool.metrics()}
+        )
+        return HttpResponse(body, content_type=PROMETHEUS_CONTENT_TYPE)
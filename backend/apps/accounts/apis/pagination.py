@@ -0,0 +1,35 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from apps.accounts.managers.user_counters import count_users
+from apps.accounts.managers.user_search import is_search
+
+
+class UserLimitOffsetPagination(LimitOffsetPagination):
+    """
+    LimitOffset com o `count` lido de UserCounters quando a listagem não
+    tem filtro (ou só filtra por is_active/is_superuser); nos demais
+    casos continua sendo um COUNT(*).
+    """
+
+    def get_count(self, queryset):
+        return count_users(queryset)
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) sobre o `id`: cada página é um
+    `WHERE id < x ORDER BY id DESC LIMIT n`, sem OFFSET e sem COUNT(*).
+    Na busca (`?q=`) o keyset é o `search_key` (relevância, depois id).
+    """
+    ordering = "-id"
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        if is_search(queryset):
+            return ("search_key",)
+        return super().get_ordering(request, queryset, view)
+
+
+PAGINATION_MODES = {
+    "cursor": UserCursorPagination,
+}
@@ -0,0 +1,38 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer com orjson. Gera os mesmos bytes do renderer do DRF
+    (compacto, UTF-8, U+2028/U+2029 escapados); tipos que o orjson não
+    conhece passam pelo encoder do DRF. Sem orjson, com indentação
+    (API navegável) ou em caso de erro, usa o JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None
+            or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:  # orjson.JSONEncodeError inclusive
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # mesmo escape do JSONRenderer (JavaScript não aceita esses dois
+        # caracteres crus dentro de strings)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -1,5 +1,13 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from apps.accounts.managers.avatar import variant_urls
 from apps.accounts.models import Usuario
+from apps.accounts.tokens import TOKEN_VERSION_CLAIM, UserRefreshToken
+
+# limite de usuários por operação em lote (ids ou filtro)
+BATCH_MAX_USERS = 10_000
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -16,10 +24,16 @@ class RegisterSerializer(serializers.ModelSerializer):
 
 class UserSerializer(serializers.ModelSerializer):
     avatar = serializers.ImageField(required=False, allow_null=True)
+    avatar_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Usuario
-        fields = ["id", "username", "email", "avatar"]
+        fields = ["id", "username", "email", "avatar", "avatar_variants"]
+
+    def get_avatar_variants(self, obj):
+        return variant_urls(
+            getattr(obj, "avatar_hash", ""), self.context.get("request")
+        )
 
 
 class LoginSerializer(serializers.Serializer):
@@ -29,3 +43,43 @@ class LoginSerializer(serializers.Serializer):
 
 class LogoutSerializer(serializers.Serializer):
     refresh = serializers.CharField(required=True)
+
+
+class BatchUserActionSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(
+        choices=["activate", "deactivate", "delete"]
+    )
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False, allow_empty=False, max_length=BATCH_MAX_USERS,
+    )
+    filter = serializers.DictField(required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError(
+                "Informe 'ids' ou 'filter' (apenas um)."
+            )
+        return attrs
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UserRefreshToken
+
+    def validate(self, attrs):
+        # A revogação em massa incrementa a versão dos tokens; refresh
+        # tokens que ainda não têm registro em OutstandingToken (na fila de
+        # outro processo) são barrados aqui, pelo claim "ver".
+        refresh = self.token_class(attrs["refresh"])
+        version = refresh.payload.get(TOKEN_VERSION_CLAIM)
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if version is not None and user_id:
+            current = (
+                Usuario.objects.filter(pk=user_id)
+                .values_list("token_version", flat=True).first()
+            )
+            if current != version:
+                raise AuthenticationFailed(
+                    "Token revogado.", code="token_revoked"
+                )
+        return super().validate(attrs)
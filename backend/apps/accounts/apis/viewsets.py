@@ -1,23 +1,62 @@
 # apps/accounts/api/viewsets.py
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
-from apps.accounts.apis.serializers import UserSerializer, LoginSerializer, LogoutSerializer # noqa E501
+from apps.accounts.apis.serializers import BATCH_MAX_USERS, BatchUserActionSerializer, UserSerializer, LoginSerializer, LogoutSerializer # noqa E501
+from apps.accounts.apis.filters import UserFilter
+from apps.accounts.apis.pagination import PAGINATION_MODES
+from apps.accounts.apis.renderers import FastJSONRenderer
+from apps.accounts.managers.batch_users import BatchUserManager
+from apps.accounts.managers.bulk_import import BulkImportManager, FORMATS, count_rows, detect_format # noqa E501
+from apps.accounts.managers.lean_users import lean_rows, serialize_users
 from apps.accounts.managers.permissions import IsSuperUser
 from apps.accounts.managers.register_manager import RegisterManager
+from apps.accounts.managers.throttling import CredentialThrottle
+from apps.accounts.managers.user_cache import cache_entry, conditional_response, get_cached_entry, user_entry # noqa E501
+from apps.accounts.managers.user_search import order_users
+from apps.accounts.managers.user_export import CONTENT_TYPES, UserExportManager # noqa E501
 from apps.accounts.models import Usuario
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.tokens import UserRefreshToken
 from rest_framework.settings import api_settings
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from core.db_router import replica_reads
+
+
+def filter_users(request, qs):
+    filterset = UserFilter(request.query_params, queryset=qs)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return filterset.qs
+
+
+def user_filter_parameters():
+    return [
+        openapi.Parameter(
+            name, openapi.IN_QUERY, type=param_type, description=description
+        )
+        for name, param_type, description in (
+            ("q", openapi.TYPE_STRING, "Busca em username/e-mail."),
+            ("username", openapi.TYPE_STRING, "Username começa com."),
+            ("email", openapi.TYPE_STRING, "E-mail começa com."),
+            ("is_active", openapi.TYPE_BOOLEAN, "Usuários ativos."),
+            ("is_superuser", openapi.TYPE_BOOLEAN, "Super usuários."),
+            ("joined_after", openapi.TYPE_STRING, "date_joined >= (ISO)."),
+            ("joined_before", openapi.TYPE_STRING, "date_joined < (ISO)."),
+        )
+    ]
 
 
 def get_tokens_for_user(user: Usuario) -> dict:
-    refresh = RefreshToken.for_user(user)
+    refresh = UserRefreshToken.for_user(user)
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),
@@ -87,8 +126,69 @@ class RegisterAPIView(APIView):
             )
 
 
+class UserBulkImportAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+    http_method_names = ["post"]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "file", openapi.IN_FORM,
+                description=(
+                    "Arquivo CSV (cabeçalho username,email,password) ou "
+                    "JSONL (um objeto por linha). Até "
+                    "BULK_IMPORT_MAX_ROWS linhas (padrão 5000); para "
+                    "arquivos maiores use `manage.py import_users`."
+                ),
+                type=openapi.TYPE_FILE, required=True
+            ),
+            openapi.Parameter(
+                "format", openapi.IN_FORM,
+                description="csv ou jsonl (padrão: pela extensão).",
+                type=openapi.TYPE_STRING, enum=list(FORMATS)
+            ),
+        ],
+        responses={200: openapi.Response("Relatório da importação.")},
+        operation_summary="(ADMIN) Importa usuários em massa",
+    )
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"errors": {"file": ["Arquivo é obrigatório."]}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fmt = request.data.get("format") or detect_format(upload.name)
+        if fmt not in FORMATS:
+            return Response(
+                {"errors": {"format": ["Formato inválido."]}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # a importação roda dentro da requisição: arquivos grandes vão
+        # pelo comando import_users
+        max_rows = getattr(settings, "BULK_IMPORT_MAX_ROWS", 5000)
+        if count_rows(upload, fmt) > max_rows:
+            return Response(
+                {"errors": {"file": [
+                    f"Máximo de {max_rows} linhas por importação."
+                ]}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        report = BulkImportManager().run(upload, fmt)
+
+        return Response(
+            {"message": "Importação concluída.", **report},
+            status=status.HTTP_200_OK
+        )
+
+
 class LoginAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [CredentialThrottle]
     http_method_names = ["post"]
 
     @swagger_auto_schema(
@@ -108,15 +208,7 @@ class LoginAPIView(APIView):
         email = serializer.validated_data.get("email")
         password = serializer.validated_data.get("password")
 
-        try:
-            user_obj = Usuario.objects.get(email=email)
-        except Usuario.DoesNotExist:
-            return Response(
-                {"errors": "Credenciais inválidas."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        user = authenticate(username=user_obj.username, password=password)
+        user = authenticate(request, email=email, password=password)
 
         if user is None:
             return Response(
@@ -153,7 +245,7 @@ class LogoutAPIView(APIView):
         refresh_token = serializer.validated_data["refresh"]
 
         try:
-            token = RefreshToken(refresh_token)
+            token = UserRefreshToken(refresh_token)
             token.blacklist()
         except Exception:
             return Response(
@@ -169,20 +261,148 @@ class LogoutAPIView(APIView):
 
 class UserListAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSuperUser]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     http_method_names = ["get"]
 
+    def get_paginator_class(self, request):
+        mode = request.query_params.get("pagination")
+        if mode is None and "cursor" in request.query_params:
+            mode = "cursor"
+
+        if mode is None or mode == "offset":
+            return api_settings.DEFAULT_PAGINATION_CLASS
+
+        try:
+            return PAGINATION_MODES[mode]
+        except KeyError:
+            raise ValidationError(
+                {"pagination": ["Modo de paginação inválido."]}
+            )
+
+    @swagger_auto_schema(
+        manual_parameters=user_filter_parameters() + [
+            openapi.Parameter(
+                "pagination", openapi.IN_QUERY,
+                description=(
+                    "Modo de paginação: 'offset' (padrão, com count) ou "
+                    "'cursor' (keyset por id, sem count)."
+                ),
+                type=openapi.TYPE_STRING, enum=["offset", "cursor"]
+            ),
+            openapi.Parameter(
+                "cursor", openapi.IN_QUERY,
+                description="Cursor opaco retornado em next/previous.",
+                type=openapi.TYPE_STRING
+            ),
+        ],
+        operation_summary="(ADMIN) Lista usuários",
+        responses={200: UserSerializer(many=True)},
+    )
+    @replica_reads
     def get(self, request, *args, **kwargs):
-        qs = Usuario.objects.all().order_by("-id")
+        # linhas de values() em vez de instâncias + UserSerializer: mesmo
+        # conteúdo, sem montar modelo e campos do DRF por linha
+        qs = lean_rows(
+            order_users(filter_users(request, Usuario.objects.all()))
+        )
 
-        paginator_class = api_settings.DEFAULT_PAGINATION_CLASS
+        paginator_class = self.get_paginator_class(request)
         if paginator_class is None:
-            serializer = UserSerializer(qs, many=True)
-            return Response(serializer.data)
+            return Response(serialize_users(qs.iterator(chunk_size=2000)))
 
         paginator = paginator_class()
         page = paginator.paginate_queryset(qs, request, view=self)
-        serializer = UserSerializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        return paginator.get_paginated_response(serialize_users(page))
+
+
+class UserExportAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+    http_method_names = ["get"]
+
+    @swagger_auto_schema(
+        manual_parameters=user_filter_parameters() + [
+            openapi.Parameter(
+                "output", openapi.IN_QUERY,
+                description="Formato do arquivo (padrão: ndjson).",
+                type=openapi.TYPE_STRING, enum=list(CONTENT_TYPES)
+            ),
+        ],
+        operation_summary="(ADMIN) Exporta usuários (NDJSON/CSV)",
+        responses={200: openapi.Response("Arquivo em streaming.")},
+    )
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get("output", "ndjson")
+        if fmt not in CONTENT_TYPES:
+            raise ValidationError({"output": ["Formato inválido."]})
+
+        qs = filter_users(request, Usuario.objects.all())
+
+        manager = UserExportManager(qs)
+        # sob ASGI o conteúdo precisa ser async para sair em partes
+        if isinstance(request._request, ASGIRequest):
+            content = manager.astream(fmt)
+        else:
+            content = manager.stream(fmt)
+        response = StreamingHttpResponse(
+            content, content_type=CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="users.{fmt}"'
+        )
+        return response
+
+
+class UserBatchAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+    http_method_names = ["post"]
+
+    @swagger_auto_schema(
+        request_body=BatchUserActionSerializer,
+        operation_summary="(ADMIN) Ativa/desativa/deleta usuários em lote",
+        operation_description=(
+            "Recebe 'ids' (lista) ou 'filter' (mesmos filtros da listagem). "
+            "Retorna o status de cada id: activated, deactivated, deleted, "
+            "unchanged, not_found ou skipped (o próprio usuário)."
+        ),
+        responses={200: openapi.Response("Resultado por id.")},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = BatchUserActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        has_more = False
+        if "ids" in data:
+            ids = data["ids"]
+        else:
+            filterset = UserFilter(data["filter"], queryset=Usuario.objects.all()) # noqa E501
+            if not filterset.is_valid():
+                raise ValidationError({"filter": filterset.errors})
+            ids = list(
+                filterset.qs.order_by("id")
+                .values_list("id", flat=True)[:BATCH_MAX_USERS + 1]
+            )
+            has_more = len(ids) > BATCH_MAX_USERS
+            ids = ids[:BATCH_MAX_USERS]
+
+        results = BatchUserManager().run(
+            # o id dos claims pode vir como string
+            data["action"], ids, actor_id=int(request.user.pk)
+        )
+
+        summary = {}
+        for result in results:
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+
+        return Response(
+            {
+                "action": data["action"],
+                "summary": summary,
+                "results": results,
+                "has_more": has_more,
+            },
+            status=status.HTTP_200_OK
+        )
 
 
 class UserDetailAPIView(APIView):
@@ -193,17 +413,16 @@ class UserDetailAPIView(APIView):
         operation_summary="(ADMIN) Busca usuário por ID",
         responses={200: UserSerializer},
     )
+    @replica_reads
     def get(self, request, user_id, *args, **kwargs):
-        try:
-            user = Usuario.objects.get(id=user_id)
-        except Usuario.DoesNotExist:
+        entry = user_entry(user_id)
+        if entry is None:
             return Response(
                 {"error": "Usuário não encontrado."},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = UserSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return conditional_response(request, entry)
 
     @swagger_auto_schema(
         operation_summary="(ADMIN) Deleta usuário por ID",
@@ -230,6 +449,11 @@ class MeAPIView(APIView):
         operation_summary="Retorna dados do usuário logado",
         responses={200: UserSerializer},
     )
+    @replica_reads
     def get(self, request, *args, **kwargs):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # o usuário já veio dos claims (ou do banco): na falta do cache
+        # basta serializá-lo, sem nova consulta
+        entry = get_cached_entry(request.user.id)
+        if entry is None:
+            entry = cache_entry(request.user)
+        return conditional_response(request, entry)
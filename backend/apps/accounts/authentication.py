@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+
+from asgiref.sync import sync_to_async
+from django.db.models.fields.files import ImageFieldFile
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from apps.accounts.managers.token_versions import aget_token_version, get_token_version # noqa E501
+from apps.accounts.models import Usuario
+from apps.accounts.tokens import TOKEN_VERSION_CLAIM, UPDATED_AT_CLAIM
+
+
+class ClaimsUser(TokenUser):
+    """Usuário montado a partir dos claims assinados do access token."""
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def avatar(self):
+        field = Usuario._meta.get_field("avatar")
+        return ImageFieldFile(None, field, self.token.get("avatar"))
+
+    @cached_property
+    def avatar_hash(self):
+        return self.token.get("avatar_hash", "")
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", False)
+
+    @cached_property
+    def updated_at(self):
+        timestamp = self.token.get(UPDATED_AT_CLAIM)
+        if timestamp is None:
+            return None
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+    @cached_property
+    def token_version(self):
+        return self.token[TOKEN_VERSION_CLAIM]
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Autenticação JWT sem consulta ao banco: o usuário vem dos claims e a
+    revogação é feita comparando a versão do token com a versão atual do
+    usuário, mantida em cache.
+
+    Tokens emitidos antes dos claims existirem caem no fluxo padrão, que
+    carrega o usuário do banco.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        user = self._claims_user(validated_token)
+        self._check_version(user, get_token_version(user.id))
+        return user
+
+    async def aauthenticate(self, request):
+        """Versão assíncrona de `authenticate` para as views async."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        user = self._claims_user(validated_token)
+        self._check_version(user, await aget_token_version(user.id))
+        return user
+
+    def _claims_user(self, validated_token):
+        user = ClaimsUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                "Usuário inativo.", code="user_inactive"
+            )
+        return user
+
+    def _check_version(self, user, current_version):
+        if current_version != user.token_version:
+            raise AuthenticationFailed(
+                "Token revogado.", code="token_revoked"
+            )
@@ -0,0 +1,56 @@
+from django.contrib.auth.backends import ModelBackend
+from apps.accounts.managers.hashing import hashing_pool, password_needs_rehash
+from apps.accounts.models import Usuario
+
+
+class EmailBackend(ModelBackend):
+    """
+    Autentica por e-mail (case-insensitive) com uma única leitura indexada
+    do usuário antes da verificação da senha, que roda no pool de hashing.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+
+        try:
+            user = Usuario.objects.by_email(email).get()
+        except Usuario.DoesNotExist:
+            # Executa o hash mesmo assim para não expor, pelo tempo de
+            # resposta, quais e-mails estão cadastrados.
+            hashing_pool.make_password(password)
+            return None
+
+        if not hashing_pool.check_password(password, user.password):
+            return None
+        if not self.user_can_authenticate(user):
+            return None
+
+        if password_needs_rehash(user.password):
+            # update() para não invalidar os tokens: a senha é a mesma
+            user.password = hashing_pool.make_password(password)
+            Usuario.objects.filter(pk=user.pk).update(password=user.password)
+        return user
+
+    async def aauthenticate(self, request, email=None, password=None,
+                            **kwargs):
+        if email is None or password is None:
+            return None
+
+        try:
+            user = await Usuario.objects.by_email(email).aget()
+        except Usuario.DoesNotExist:
+            await hashing_pool.amake_password(password)
+            return None
+
+        if not await hashing_pool.acheck_password(password, user.password):
+            return None
+        if not self.user_can_authenticate(user):
+            return None
+
+        if password_needs_rehash(user.password):
+            user.password = await hashing_pool.amake_password(password)
+            await Usuario.objects.filter(pk=user.pk).aupdate(
+                password=user.password
+            )
+        return user
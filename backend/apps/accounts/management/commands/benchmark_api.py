@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment, teardown_test_environment,
+)
+from apps.accounts.managers.benchmark import ENDPOINTS, BenchmarkSuite, HttpTransport, compare # noqa E501
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede latência (p50/p95/p99), throughput e número de queries dos "
+        "endpoints de autenticação e administração."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--concurrency", type=int, nargs="+", default=[8],
+            help="Um ou mais níveis de concorrência (ex.: 1 8 32 64).",
+        )
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS
+        )
+        parser.add_argument(
+            "--output", default="benchmark.json",
+            help="Arquivo JSON com o resultado.",
+        )
+        parser.add_argument(
+            "--baseline", help="Resultado anterior para comparação.",
+        )
+        parser.add_argument(
+            "--keepdb", action="store_true",
+            help="Reaproveita o banco de teste entre execuções.",
+        )
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Mede um servidor já rodando (ex.: http://localhost:8000) "
+                "em vez do client em processo. Os usuários de teste são "
+                "criados no banco configurado, o mesmo do servidor."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"]) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Baseline inválida: {e}")
+
+        if options["base_url"]:
+            result = self.build_suite(
+                options, HttpTransport(options["base_url"])
+            ).run(options["concurrency"])
+        else:
+            result = self.run_in_process(options)
+
+        if baseline is not None:
+            result["diff_vs_baseline_pct"] = compare(result, baseline)
+
+        with open(options["output"], "w") as f:
+            json.dump(result, f, indent=2)
+
+        scaling = result.get("scaling") or {
+            str(result["meta"]["concurrency"]): result["endpoints"]
+        }
+        for level, endpoints in scaling.items():
+            self.stdout.write(f"concorrência {level}")
+            self.print_table(endpoints)
+        self.stdout.write(self.style.SUCCESS(
+            f"Resultado salvo em {options['output']}"
+        ))
+
+    def build_suite(self, options, transport=None):
+        return BenchmarkSuite(
+            users=options["users"],
+            requests=options["requests"],
+            concurrency=options["concurrency"][0],
+            endpoints=options["endpoints"],
+            warmup=options["warmup"],
+            transport=transport,
+        )
+
+    def run_in_process(self, options):
+        # roda num banco de teste descartável (SQLite ou Postgres,
+        # conforme DATABASES), nunca no banco da aplicação
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        if connection.vendor == "sqlite":
+            # SQLite em memória com vários clientes trava a tabela inteira;
+            # um arquivo temporário se comporta como em produção
+            test_settings = connection.settings_dict.setdefault("TEST", {})
+            test_settings["NAME"] = os.path.join(
+                tempfile.gettempdir(), "benchmark_api.sqlite3"
+            )
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            return self.build_suite(options).run(options["concurrency"])
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+    def print_table(self, endpoints):
+        header = (
+            f"{'endpoint':<10} {'req/s':>8} {'p50':>8} {'p95':>8} "
+            f"{'p99':>8} {'queries':>8} {'erros':>6}"
+        )
+        self.stdout.write(header)
+        for name, r in endpoints.items():
+            lat = r["latency_ms"]
+            self.stdout.write(
+                f"{name:<10} {r['throughput_rps'] or 0:>8.1f} "
+                f"{lat['p50'] or 0:>8.2f} {lat['p95'] or 0:>8.2f} "
+                f"{lat['p99'] or 0:>8.2f} {r['queries']['mean'] or 0:>8.1f} "
+                f"{r['errors']:>6}"
+            )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from core.openapi import schema_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera o schema OpenAPI da versão atual do código (servido em "
+        "/swagger.json, /swagger.yaml e pelas telas do Swagger/ReDoc)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Gera de novo mesmo se o arquivo desta versão já existe.",
+        )
+
+    def handle(self, *args, **options):
+        schema_cache.clear()
+        path = schema_cache.path()
+        if path.exists() and not options["force"]:
+            self.stdout.write(f"Schema já gerado: {path}")
+            return
+
+        body = schema_cache.build()
+        self.stdout.write(self.style.SUCCESS(
+            f"Schema gerado ({len(body)} bytes): {path}"
+        ))
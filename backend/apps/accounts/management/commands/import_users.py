@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.accounts.managers.bulk_import import BulkImportManager, FORMATS, detect_format # noqa E501
+
+
+class Command(BaseCommand):
+    help = "Importa usuários em massa a partir de um arquivo CSV ou JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Caminho do arquivo.")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=4)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        manager = BulkImportManager(
+            chunk_size=options["chunk_size"], workers=options["workers"]
+        )
+
+        try:
+            with open(path, "rb") as stream:
+                report = manager.run(stream, fmt)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']} de {report['total']} usuários importados."
+        ))
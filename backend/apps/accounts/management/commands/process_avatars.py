@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from apps.accounts.managers.avatar import process_avatar
+from apps.accounts.models import Usuario
+
+
+class Command(BaseCommand):
+    help = "Gera as miniaturas dos avatares já cadastrados."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Reprocessa também usuários que já têm miniaturas.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        qs = Usuario.objects.exclude(avatar="").exclude(avatar__isnull=True)
+        if not options["force"]:
+            qs = qs.filter(avatar_hash="")
+
+        processed = skipped = 0
+        rows = qs.values_list("id", "avatar").iterator(
+            chunk_size=options["chunk_size"]
+        )
+        for user_id, name in rows:
+            field_file = Usuario(avatar=name).avatar
+            try:
+                with field_file.open("rb") as f:
+                    digest = process_avatar(f)
+            except OSError:
+                digest = ""
+
+            if not digest:
+                skipped += 1
+                self.stderr.write(f"Usuário {user_id}: avatar inválido.")
+                continue
+
+            # update() direto: não invalida os tokens do usuário
+            Usuario.objects.filter(id=user_id).update(avatar_hash=digest)
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{processed} avatares processados, {skipped} ignorados."
+        ))
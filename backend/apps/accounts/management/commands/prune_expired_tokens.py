@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.accounts.managers.token_pruning import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove em lotes os refresh tokens expirados das tabelas do "
+        "token_blacklist."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--pause", type=float, default=0.05,
+            help="Pausa (s) entre os lotes.",
+        )
+        parser.add_argument(
+            "--max-seconds", type=float, default=None,
+            help="Para depois deste tempo; o resto fica para a próxima.",
+        )
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Roda sem parar, uma limpeza a cada --interval segundos.",
+        )
+        parser.add_argument("--interval", type=float, default=300)
+
+    def handle(self, *args, **options):
+        while True:
+            # com --loop a conexão vive entre as rodadas: descarta a que
+            # caiu ou passou de CONN_MAX_AGE, como no fim de uma requisição
+            close_old_connections()
+            result = prune_expired_tokens(
+                batch_size=options["batch_size"],
+                max_seconds=options["max_seconds"],
+                pause=options["pause"],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{result['outstanding']} tokens expirados removidos "
+                f"({result['blacklisted']} da blacklist) em "
+                f"{result['batches']} lotes, {result['seconds']:.2f} s."
+            ))
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from apps.accounts.managers.user_counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recalcula os contadores de usuários (UserCounters)."
+
+    def handle(self, *args, **options):
+        actual, drift = reconcile()
+
+        for name, value in actual.items():
+            line = f"{name}: {value}"
+            if drift[name]:
+                line += f" (corrigido em {drift[name]:+d})"
+            self.stdout.write(line)
+
+        if any(drift.values()):
+            self.stdout.write(self.style.WARNING("Contadores corrigidos."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Contadores em dia."))
@@ -0,0 +1,115 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# O que um worker importa ao subir: WSGI + URLconf (carregado pelo Django
+# só na primeira requisição; aqui é forçado).
+BOOT_SCRIPT = (
+    "from django.core.wsgi import get_wsgi_application\n"
+    "get_wsgi_application()\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+# Módulos que devem ficar fora da subida (importados no primeiro uso). Os
+# decorators do drf-yasg (drf_yasg.utils/openapi) são leves e ficam nas
+# views; o gerador, os inspectors e as views do schema, não.
+LAZY_MODULES = (
+    "drf_yasg.generators", "drf_yasg.inspectors", "drf_yasg.views", "google",
+)
+
+
+def parse_importtime(output):
+    """
+    Linhas do `-X importtime` -> [(módulo, self_us, cumulativo_us,
+    nível)]. O nível é a profundidade na árvore de imports.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        level = (len(name) - len(name.lstrip())) // 2
+        rows.append(
+            (name.strip(), int(fields[0]), int(fields[1]), level)
+        )
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o custo de import da subida de um worker (python -X "
+        "importtime num processo novo), por pacote."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--budget-ms", type=float,
+            default=getattr(settings, "STARTUP_IMPORT_BUDGET_MS", 0),
+            help="Falha se o total passar deste valor (0 = sem limite).",
+        )
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument(
+            "--modules", action="store_true",
+            help="Lista por módulo em vez de por pacote.",
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+            env=env, capture_output=True, text=True,
+        )
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0 or not rows:
+            raise CommandError(
+                "Falha ao subir o processo de medição:\n"
+                + result.stderr[-2000:]
+            )
+
+        total_us = sum(cumulative for _, _, cumulative, level in rows
+                       if level == 0)
+
+        costs = defaultdict(int)
+        for name, self_us, _, _ in rows:
+            key = name if options["modules"] else name.split(".")[0]
+            costs[key] += self_us
+
+        self.stdout.write(f"{'pacote/módulo':<50} {'ms':>9} {'%':>6}")
+        ranked = sorted(costs.items(), key=lambda item: -item[1])
+        for name, cost in ranked[:options["limit"]]:
+            self.stdout.write(
+                f"{name:<50} {cost / 1000:>9.1f} "
+                f"{100 * cost / total_us:>5.1f}%"
+            )
+
+        loaded = {name for name, _, _, _ in rows}
+        eager = [
+            module for module in LAZY_MODULES
+            if any(
+                name == module or name.startswith(module + ".")
+                for name in loaded
+            )
+        ]
+        if eager:
+            self.stdout.write(self.style.WARNING(
+                "Importados na subida (deveriam ser lazy): "
+                + ", ".join(eager)
+            ))
+
+        total_ms = total_us / 1000
+        budget = options["budget_ms"]
+        summary = f"Total: {total_ms:.1f} ms em {len(rows)} módulos"
+        if budget:
+            summary += f" (orçamento: {budget:.0f} ms)"
+            if total_ms > budget:
+                raise CommandError(summary + " - acima do orçamento.")
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,86 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+VARIANTS_DIR = "avatars/variants"
+
+
+def _sizes():
+    return getattr(settings, "AVATAR_SIZES", (64, 256))
+
+
+def _format():
+    if features.check("webp"):
+        return "WEBP", "webp"
+    return "JPEG", "jpg"
+
+
+def variant_name(digest, size, ext=None):
+    if ext is None:
+        _, ext = _format()
+    return f"{VARIANTS_DIR}/{digest[:2]}/{digest}/{size}.{ext}"
+
+
+def variant_urls(digest, request=None):
+    """URLs das miniaturas do avatar, por tamanho (ex.: {"64": url})."""
+    if not digest:
+        return None
+    urls = {}
+    for size in _sizes():
+        url = default_storage.url(variant_name(digest, size))
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        urls[str(size)] = url
+    return urls
+
+
+def _save_variant(name, content):
+    # o nome é o hash do conteúdo: se outro processo gravou o mesmo
+    # arquivo no meio tempo, o storage salvaria com outro nome
+    # (name_abc123.webp); fica o que já existe
+    if default_storage.exists(name):
+        return
+    saved = default_storage.save(name, ContentFile(content))
+    if saved != name:
+        default_storage.delete(saved)
+
+
+def process_avatar(file):
+    """
+    Gera as miniaturas quadradas do avatar e as grava por hash do
+    conteúdo (imagens iguais são guardadas uma vez só). Retorna o hash,
+    ou "" se o arquivo não for uma imagem válida.
+    """
+    file.seek(0)
+    data = file.read()
+    file.seek(0)
+
+    digest = hashlib.sha256(data).hexdigest()
+    names = {size: variant_name(digest, size) for size in _sizes()}
+    missing = [s for s, name in names.items()
+               if not default_storage.exists(name)]
+    if not missing:
+        return digest
+
+    try:
+        image = Image.open(BytesIO(data))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError,
+            ValueError):
+        return ""
+
+    pil_format, _ = _format()
+    image = image.convert("RGBA" if pil_format == "WEBP" else "RGB")
+
+    for size in missing:
+        thumb = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        thumb.save(buffer, pil_format, quality=85)
+        _save_variant(names[size], buffer.getvalue())
+
+    return digest
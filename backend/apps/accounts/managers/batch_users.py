@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Usuario
+from .revocation import blacklist_user_tokens
+from .token_versions import forget_token_versions
+from .user_counters import apply_delta, counters_suspended
+from .user_cache import forget_user_payloads
+
+ACTIONS = ("activate", "deactivate", "delete")
+
+
+class BatchUserManager:
+    """
+    Ativa, desativa ou remove usuários em massa.
+
+    Os ids são processados em lotes de `chunk_size`, cada um na sua
+    transação e com consultas por conjunto: um SELECT para saber quais
+    existem, um UPDATE (ou DELETE) para o lote inteiro e a revogação dos
+    refresh tokens em lote. Devolve o resultado de cada id; o próprio
+    `actor_id` nunca é alterado.
+    """
+
+    def __init__(self, chunk_size=500):
+        self.chunk_size = chunk_size
+
+    def run(self, action, ids, actor_id=None):
+        if action not in ACTIONS:
+            raise ValueError(f"Ação inválida: {action}")
+
+        results = {}
+        # mantém a ordem recebida e ignora ids repetidos
+        ids = list(dict.fromkeys(ids))
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+            results.update(self._run_chunk(action, chunk, actor_id))
+
+        return [{"id": pk, "status": results[pk]} for pk in ids]
+
+    def _run_chunk(self, action, ids, actor_id):
+        results = {}
+        with transaction.atomic():
+            current = {
+                pk: (is_active, is_superuser)
+                for pk, is_active, is_superuser in (
+                    Usuario.objects.select_for_update().filter(pk__in=ids)
+                    .values_list("id", "is_active", "is_superuser")
+                )
+            }
+
+            targets = []
+            for pk in ids:
+                if pk not in current:
+                    results[pk] = "not_found"
+                elif pk == actor_id:
+                    results[pk] = "skipped"
+                elif action == "activate" and current[pk][0]:
+                    results[pk] = "unchanged"
+                elif action == "deactivate" and not current[pk][0]:
+                    results[pk] = "unchanged"
+                else:
+                    targets.append(pk)
+
+            if not targets:
+                return results
+
+            if action != "activate":
+                blacklist_user_tokens(targets)
+
+            if action == "delete":
+                # os sinais de delete não contam um a um: uma só variação
+                with counters_suspended():
+                    Usuario.objects.filter(pk__in=targets).delete()
+                apply_delta(
+                    total=-len(targets),
+                    active=-sum(current[pk][0] for pk in targets),
+                    superusers=-sum(current[pk][1] for pk in targets),
+                )
+                status = "deleted"
+            else:
+                # update() não passa pelo save(): a versão dos tokens é
+                # incrementada aqui, invalidando os claims já emitidos
+                with counters_suspended():
+                    Usuario.objects.filter(pk__in=targets).update(
+                        is_active=(action == "activate"),
+                        token_version=F("token_version") + 1,
+                        updated_at=timezone.now(),
+                    )
+                sign = 1 if action == "activate" else -1
+                apply_delta(active=sign * len(targets))
+                status = action + "d"
+
+            forget_token_versions(targets)
+            forget_user_payloads(targets)
+            results.update(dict.fromkeys(targets, status))
+
+        return results
@@ -0,0 +1,329 @@
+import itertools
+import math
+import platform
+import threading
+import time
+
+import django
+import requests as http
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Usuario
+from ..tokens import UserRefreshToken
+
+BENCH_PASSWORD = "Bench#2024pw"
+
+ENDPOINTS = ("login", "register", "refresh", "me", "user_list")
+
+
+def percentile(values, pct):
+    """Percentil pelo método nearest-rank (valores já ordenados)."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(s["ms"] for s in samples)
+    queries = [s["queries"] for s in samples if s["queries"] is not None]
+    errors = [s for s in samples if not s["ok"]]
+    throughput = round(len(samples) / elapsed, 2) if elapsed else None
+    summary = {
+        "requests": len(samples),
+        "errors": len(errors),
+        "throughput_rps": throughput,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3)
+            if latencies else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+        },
+        "queries": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+    }
+    if errors:
+        summary["error_statuses"] = sorted({s["status"] for s in errors})
+    return summary
+
+
+class InProcessTransport:
+    """Executa as requisições com o `django.test.Client`, no processo."""
+
+    name = "in-process"
+    counts_queries = True
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def client(self):
+        if not hasattr(self._local, "client"):
+            self._local.client = Client(raise_request_exception=False)
+        return self._local.client
+
+    def request(self, method, path, data=None, headers=None, fmt="json"):
+        kwargs = {"headers": headers or {}}
+        if data is not None and fmt == "json":
+            kwargs["content_type"] = "application/json"
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(path, data, **kwargs)
+        return response.status_code, len(ctx.captured_queries)
+
+
+class HttpTransport:
+    """
+    Requisições HTTP reais contra um servidor já rodando (uvicorn ou
+    gunicorn), uma sessão keep-alive por cliente. Não conta queries.
+    """
+
+    counts_queries = False
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.name = f"http {self.base_url}"
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = http.Session()
+        return self._local.session
+
+    def request(self, method, path, data=None, headers=None, fmt="json"):
+        kwargs = {"headers": headers or {}, "timeout": self.timeout}
+        if method == "get":
+            kwargs["params"] = data
+        elif fmt == "json":
+            kwargs["json"] = data
+        else:
+            kwargs["data"] = data
+        try:
+            response = self.session.request(
+                method.upper(), self.base_url + path, **kwargs
+            )
+        except http.RequestException:
+            return 599, None
+        return response.status_code, None
+
+
+class BenchmarkSuite:
+    """
+    Popula `users` usuários e mede login, register, refresh, me e a
+    listagem de usuários com `concurrency` clientes simultâneos.
+    """
+
+    def __init__(self, users=1000, requests=200, concurrency=8,
+                 endpoints=ENDPOINTS, transport=None, warmup=5):
+        self.users = users
+        self.requests = requests
+        self.concurrency = concurrency
+        self.endpoints = endpoints
+        self.transport = transport or InProcessTransport()
+        self.warmup = warmup
+        self._counter = itertools.count()
+
+    def seed(self):
+        password = make_password(BENCH_PASSWORD)
+        existing = Usuario.objects.filter(
+            username__startswith="bench_"
+        ).count()
+        Usuario.objects.bulk_create(
+            [
+                Usuario(
+                    username=f"bench_{i}",
+                    email=f"bench_{i}@bench.local",
+                    password=password,
+                )
+                for i in range(existing, self.users)
+            ],
+            batch_size=1000,
+        )
+        self.admin, _ = Usuario.objects.get_or_create(
+            username="bench_admin",
+            defaults={
+                "email": "bench_admin@bench.local",
+                "password": password,
+                "is_superuser": True,
+                "is_staff": True,
+            },
+        )
+        self.sample = list(
+            Usuario.objects.filter(username__startswith="bench_")
+            .exclude(pk=self.admin.pk)
+            .order_by("id")[:max(self.requests, 1)]
+        )
+        admin_refresh = UserRefreshToken.for_user(self.admin)
+        self.admin_headers = {
+            "Authorization": f"Bearer {admin_refresh.access_token}"
+        }
+        self.refresh_tokens = [
+            str(UserRefreshToken.for_user(u)) for u in self.sample
+        ]
+        self.user_headers = [
+            {"Authorization": f"Bearer {UserRefreshToken(t).access_token}"}
+            for t in self.refresh_tokens
+        ]
+
+    def _pick(self, items, i):
+        return items[i % len(items)]
+
+    def login(self, i):
+        user = self._pick(self.sample, i)
+        return self.transport.request(
+            "post", reverse("auth-login"),
+            {"email": user.email, "password": BENCH_PASSWORD},
+        )
+
+    def register(self, i):
+        n = next(self._counter)
+        stamp = f"{timezone.now():%H%M%S%f}_{n}"
+        return self.transport.request(
+            "post", reverse("auth-register"),
+            {
+                "username": f"bench_new_{stamp}",
+                "email": f"bench_new_{stamp}@bench.local",
+                "password": BENCH_PASSWORD,
+                "password2": BENCH_PASSWORD,
+            },
+            headers=self.admin_headers, fmt="multipart",
+        )
+
+    def refresh(self, i):
+        return self.transport.request(
+            "post", reverse("token_refresh"),
+            {"refresh": self._pick(self.refresh_tokens, i)},
+        )
+
+    def me(self, i):
+        return self.transport.request(
+            "get", reverse("me"), headers=self._pick(self.user_headers, i)
+        )
+
+    def user_list(self, i):
+        return self.transport.request(
+            "get", reverse("admin-user-list"), {"offset": (i * 10) % 500},
+            headers=self.admin_headers,
+        )
+
+    def _timed(self, action, i):
+        started = time.perf_counter()
+        status_code, queries = action(i)
+        return {
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            "status": status_code,
+            "ok": 200 <= status_code < 300,
+            "queries": queries if self.transport.counts_queries else None,
+        }
+
+    def run_endpoint(self, name):
+        action = getattr(self, name)
+        for i in range(self.warmup):
+            action(i)
+
+        started = time.perf_counter()
+        if self.concurrency <= 1:
+            samples = [self._timed(action, i) for i in range(self.requests)]
+        else:
+            samples = self._run_concurrently(action)
+        return summarize(samples, time.perf_counter() - started)
+
+    def _run_concurrently(self, action):
+        indexes = iter(range(self.requests))
+        lock = threading.Lock()
+        samples = []
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        i = next(indexes, None)
+                    if i is None:
+                        return
+                    sample = self._timed(action, i)
+                    with lock:
+                        samples.append(sample)
+            finally:
+                # cada thread tem sua conexão; fecha para não segurar o
+                # banco de teste aberto
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker) for _ in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples
+
+    def run(self, concurrency_levels=None):
+        """
+        Com vários níveis de concorrência, `endpoints` traz o primeiro e
+        `scaling` o resultado de cada nível.
+        """
+        self.seed()
+        levels = list(concurrency_levels or [self.concurrency])
+        runs = {}
+        # o limite de tentativas de login derrubaria o benchmark com 429;
+        # contra um servidor (--base-url) use LOGIN_THROTTLE_ENABLED=False
+        with override_settings(LOGIN_THROTTLE_ENABLED=False):
+            for level in levels:
+                self.concurrency = level
+                runs[level] = {
+                    name: self.run_endpoint(name) for name in self.endpoints
+                }
+
+        result = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "transport": self.transport.name,
+                "database": connection.vendor,
+                "users": self.users,
+                "requests": self.requests,
+                "concurrency": levels[0] if len(levels) == 1 else levels,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "endpoints": runs[levels[0]],
+        }
+        if len(levels) > 1:
+            result["scaling"] = {str(level): runs[level] for level in levels}
+        return result
+
+
+def compare(current, baseline):
+    """Variação (%) de p95, throughput e queries em relação à baseline."""
+    diff = {}
+    for name, result in current["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(name)
+        if not old:
+            continue
+        diff[name] = {
+            "p95_ms": _delta(
+                result["latency_ms"]["p95"], old["latency_ms"]["p95"]
+            ),
+            "throughput_rps": _delta(
+                result["throughput_rps"], old["throughput_rps"]
+            ),
+            "queries_mean": _delta(
+                result["queries"]["mean"], old["queries"]["mean"]
+            ),
+        }
+    return diff
+
+
+def _delta(new, old):
+    if new is None or not old:
+        return None
+    return round((new - old) / old * 100, 1)
@@ -0,0 +1,226 @@
+import codecs
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from ..models import Usuario
+from .user_counters import apply_delta
+
+FORMATS = ("csv", "jsonl")
+
+DECODE_ERROR = "Arquivo não está em UTF-8."
+
+username_validator = UnicodeUsernameValidator()
+
+USERNAME_MAX_LENGTH = Usuario._meta.get_field("username").max_length
+EMAIL_MAX_LENGTH = Usuario._meta.get_field("email").max_length
+
+
+def detect_format(filename, default="csv"):
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def iter_rows(stream, fmt):
+    """
+    Lê o arquivo (binário) linha a linha, sem carregá-lo inteiro em
+    memória. Gera `(numero_da_linha, dados | None, erro | None)`.
+
+    Um arquivo que não é UTF-8 ou um CSV malformado (aspas sem fechar,
+    campo grande demais) gera um erro na linha onde a leitura parou e
+    encerra a leitura.
+    """
+    lines = codecs.iterdecode(stream, "utf-8-sig")
+
+    if fmt == "csv":
+        reader = csv.DictReader(lines, strict=True)
+        try:
+            for data in reader:
+                yield reader.line_num, data, None
+        except UnicodeDecodeError:
+            yield reader.line_num + 1, None, {"row": [DECODE_ERROR]}
+        except csv.Error as e:
+            yield reader.line_num + 1, None, {"row": [f"CSV inválido: {e}."]}
+        return
+
+    line_no = 0
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield line_no, None, {"row": ["JSON inválido."]}
+                continue
+            if not isinstance(data, dict):
+                yield line_no, None, {"row": ["Esperado um objeto JSON."]}
+                continue
+            yield line_no, data, None
+    except UnicodeDecodeError:
+        yield line_no + 1, None, {"row": [DECODE_ERROR]}
+
+
+def count_rows(stream, fmt):
+    """Linhas de dados do arquivo (volta o arquivo para o início)."""
+    total = sum(1 for _ in iter_rows(stream, fmt))
+    stream.seek(0)
+    return total
+
+
+class BulkImportManager:
+    """
+    Importação em massa de usuários.
+
+    As linhas são validadas em lotes de `chunk_size`: uma única consulta
+    por lote verifica username/e-mail já existentes, as senhas são
+    hasheadas em paralelo e o lote é gravado com um `bulk_create`.
+    """
+
+    def __init__(self, chunk_size=500, workers=4):
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def run(self, stream, fmt):
+        report = {"total": 0, "created": 0, "errors": []}
+        chunk = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for line_no, data, errors in iter_rows(stream, fmt):
+                report["total"] += 1
+                if errors is None:
+                    data, errors = self._clean(data)
+                if errors:
+                    report["errors"].append({"row": line_no, "errors": errors})
+                    continue
+
+                chunk.append((line_no, data))
+                if len(chunk) >= self.chunk_size:
+                    self._import_chunk(chunk, executor, report)
+                    chunk = []
+
+            if chunk:
+                self._import_chunk(chunk, executor, report)
+
+        return report
+
+    def _clean(self, data):
+        username = Usuario.normalize_username(
+            str(data.get("username") or "").strip()
+        )
+        email = Usuario.objects.normalize_email(str(data.get("email") or ""))
+        password = str(data.get("password") or "")
+        errors = {}
+
+        try:
+            username_validator(username)
+        except DjangoValidationError as e:
+            errors["username"] = list(e.messages)
+        if not username:
+            errors["username"] = ["Este campo é obrigatório."]
+        elif len(username) > USERNAME_MAX_LENGTH:
+            errors["username"] = [
+                f"Máximo de {USERNAME_MAX_LENGTH} caracteres."
+            ]
+
+        try:
+            validate_email(email)
+            if len(email) > EMAIL_MAX_LENGTH:
+                raise DjangoValidationError("")
+        except DjangoValidationError:
+            errors["email"] = ["Informe um endereço de email válido."]
+
+        if len(password) < 8:
+            errors["password"] = ["Precisa conter pelo menos 8 caracteres."]
+        else:
+            user = Usuario(username=username, email=email)
+            try:
+                validate_password(password, user)
+            except DjangoValidationError as e:
+                errors["password"] = list(e.messages)
+
+        cleaned = {"username": username, "email": email, "password": password}
+        return cleaned, errors
+
+    def _import_chunk(self, chunk, executor, report):
+        usernames = {data["username"] for _, data in chunk}
+        emails = {data["email"] for _, data in chunk}
+
+        existing = (
+            Usuario.objects.alias(email_lower=Lower("email"))
+            .filter(Q(username__in=usernames) | Q(email_lower__in=emails))
+            .values_list("username", "email")
+        )
+        taken_usernames = set()
+        taken_emails = set()
+        for username, email in existing:
+            taken_usernames.add(username)
+            taken_emails.add(email.lower())
+
+        rows = []
+        for line_no, data in chunk:
+            errors = {}
+            if data["username"] in taken_usernames:
+                errors["username"] = ["Este username já está registrado."]
+            if data["email"] in taken_emails:
+                errors["email"] = ["Este email já está registrado."]
+            if errors:
+                report["errors"].append({"row": line_no, "errors": errors})
+                continue
+            # duplicados dentro do próprio arquivo
+            taken_usernames.add(data["username"])
+            taken_emails.add(data["email"])
+            rows.append((line_no, data))
+
+        hashes = executor.map(
+            make_password, [data["password"] for _, data in rows]
+        )
+        users = [
+            Usuario(
+                username=data["username"],
+                email=data["email"],
+                password=password_hash,
+            )
+            for (_, data), password_hash in zip(rows, hashes)
+        ]
+
+        try:
+            with transaction.atomic():
+                Usuario.objects.bulk_create(users)
+                # bulk_create não dispara post_save
+                apply_delta(total=len(users), active=len(users))
+            report["created"] += len(users)
+        except IntegrityError:
+            # alguém cadastrou um desses usuários entre a consulta e o
+            # insert: grava um a um para apontar a linha com conflito
+            self._save_one_by_one(rows, users, report)
+
+    def _save_one_by_one(self, rows, users, report):
+        for (line_no, _), user in zip(rows, users):
+            user.pk = None
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+                report["created"] += 1
+            except IntegrityError:
+                report["errors"].append({
+                    "row": line_no,
+                    "errors": {
+                        "non_field_errors": [
+                            "Username ou email já registrado."
+                        ]
+                    },
+                })
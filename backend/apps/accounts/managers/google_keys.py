@@ -0,0 +1,160 @@
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_OAUTH2_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def default_fetcher(url, method="GET", **kwargs):
+    from google.auth.transport.requests import Request
+
+    return Request()(url, method=method, **kwargs)
+
+
+class _CachedResponse:
+    def __init__(self, status, headers, data):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+class _Entry:
+    def __init__(self, response, expires_at, fetched_at):
+        self.response = response
+        self.expires_at = expires_at
+        self.fetched_at = fetched_at
+
+
+class GoogleCertsCache:
+    """
+    Cache por processo dos certificados públicos do Google.
+
+    Implementa a interface de `google.auth.transport.Request`, então pode
+    ser passado direto para `id_token.verify_oauth2_token`. Respeita o
+    `Cache-Control: max-age` da resposta, só permite uma renovação por vez
+    e, se a busca falhar, continua servindo as chaves antigas.
+    """
+
+    default_max_age = 300
+    retry_after_failure = 30
+    min_forced_refresh_interval = 60
+
+    def __init__(self, fetcher=None, clock=time.monotonic):
+        self._fetcher = fetcher or default_fetcher
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def __call__(self, url, method="GET", body=None, headers=None,
+                 timeout=None, **kwargs):
+        if method != "GET":
+            return self._fetcher(
+                url, method=method, body=body, headers=headers,
+                timeout=timeout, **kwargs
+            )
+        return self.get(url)
+
+    def set_fetcher(self, fetcher):
+        """Troca a origem das chaves (ex.: emissor falso em testes)."""
+        with self._lock:
+            self._fetcher = fetcher or default_fetcher
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, url):
+        entry = self._entries.get(url)
+        if entry is not None and entry.expires_at > self._clock():
+            return entry.response
+
+        if entry is None:
+            self._lock.acquire()
+        elif not self._lock.acquire(blocking=False):
+            # outra thread já está renovando: usa as chaves antigas
+            return entry.response
+
+        try:
+            entry = self._entries.get(url)
+            if entry is not None and entry.expires_at > self._clock():
+                return entry.response
+            return self._refresh(url, entry)
+        finally:
+            self._lock.release()
+
+    def force_refresh(self, url):
+        """
+        Expira as chaves de `url` (ex.: `kid` desconhecido após rotação).
+        Limitado a uma vez por `min_forced_refresh_interval` segundos para
+        que tokens forjados não provoquem uma busca por requisição.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return False
+            elapsed = self._clock() - entry.fetched_at
+            if elapsed < self.min_forced_refresh_interval:
+                return False
+            entry.expires_at = 0
+            return True
+
+    def _refresh(self, url, stale):
+        now = self._clock()
+        try:
+            response = self._fetcher(url, method="GET")
+            if response.status != 200:
+                raise ValueError(
+                    f"Status {response.status} ao buscar certificados."
+                )
+        except Exception:
+            if stale is None:
+                raise
+            logger.warning(
+                "Falha ao renovar certificados do Google; usando cache "
+                "antigo.", exc_info=True
+            )
+            stale.expires_at = now + self.retry_after_failure
+            return stale.response
+
+        cached = _CachedResponse(
+            response.status, dict(response.headers), response.data
+        )
+        max_age = self._max_age(cached.headers)
+        self._entries[url] = _Entry(cached, now + max_age, now)
+        return cached
+
+    def _max_age(self, headers):
+        for name, value in headers.items():
+            if name.lower() == "cache-control":
+                match = _MAX_AGE_RE.search(value)
+                if match:
+                    return int(match.group(1))
+        return self.default_max_age
+
+
+google_certs = GoogleCertsCache()
+
+
+def verify_google_id_token(token, audience, certs=None):
+    """
+    Valida um ID token do Google usando os certificados em cache.
+    Levanta `ValueError` (ou subclasse) se o token for inválido.
+    """
+    from google.auth import exceptions
+    from google.oauth2 import id_token
+
+    certs = certs or google_certs
+    try:
+        return id_token.verify_oauth2_token(token, certs, audience)
+    except exceptions.MalformedError as e:
+        if "not found" not in str(e):
+            raise
+        if not certs.force_refresh(GOOGLE_OAUTH2_CERTS_URL):
+            raise
+        return id_token.verify_oauth2_token(token, certs, audience)
@@ -0,0 +1,75 @@
+import re
+
+from django.db import IntegrityError, transaction
+
+from ..models import Usuario
+from .register_manager import unique_violation_errors
+
+USERNAME_MAX_LENGTH = Usuario._meta.get_field("username").max_length
+
+# Novas tentativas quando outro cadastro leva o username escolhido entre
+# a consulta e o INSERT.
+ATTEMPTS = 3
+
+# Espaço reservado no fim do username para o sufixo numérico.
+SUFFIX_DIGITS = 6
+
+
+def allocate_username(base):
+    """
+    `base` se estiver livre; senão `base` com o menor sufixo numérico
+    livre (`base2`, `base3`, ...).
+
+    Uma consulta por prefixo (username LIKE 'prefixo%', coberta pelo
+    índice varchar_pattern_ops do username no Postgres) traz os já usados.
+    O prefixo deixa SUFFIX_DIGITS caracteres livres: todo candidato começa
+    com ele, mesmo quando `base` ocupa o tamanho máximo.
+    """
+    base = re.sub(r"[^\w.@+-]", "", base) or "user"
+    base = base[:USERNAME_MAX_LENGTH]
+    prefix = base[:USERNAME_MAX_LENGTH - SUFFIX_DIGITS]
+    taken = set(
+        Usuario.objects.filter(username__startswith=prefix)
+        .values_list("username", flat=True)
+    )
+    if base not in taken:
+        return base
+
+    suffix = 2
+    while True:
+        candidate = prefix + str(suffix)
+        if candidate not in taken:
+            return candidate
+        suffix += 1
+
+
+def get_or_create_google_user(email):
+    """
+    Usuário do login com Google, criado no primeiro acesso. Devolve
+    `(usuario, criado)`.
+
+    Idempotente: se outro login do mesmo email criar o usuário ao mesmo
+    tempo, o INSERT perde para a restrição única e o usuário já gravado é
+    devolvido. Sem travas: a disputa é resolvida pelas restrições.
+    """
+    email = Usuario.objects.normalize_email(email)
+    user = Usuario.objects.by_email(email).first()
+    if user is not None:
+        return user, False
+
+    for attempt in range(ATTEMPTS):
+        user = Usuario(
+            username=allocate_username(email.split("@")[0]),
+            email=email,
+        )
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+            return user, True
+        except IntegrityError as e:
+            existing = Usuario.objects.by_email(email).first()
+            if existing is not None:
+                return existing, False
+            errors = unique_violation_errors(e) or {}
+            if "username" not in errors or attempt == ATTEMPTS - 1:
+                raise
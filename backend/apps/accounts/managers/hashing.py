@@ -0,0 +1,208 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Servidor ocupado, tente novamente em instantes."
+    default_code = "hashing_pool_busy"
+    # vira o header Retry-After no exception handler do DRF
+    wait = 1
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _make_password(raw_password):
+    return hashers.make_password(raw_password)
+
+
+def _check_password(raw_password, encoded):
+    return hashers.check_password(raw_password, encoded)
+
+
+def password_needs_rehash(encoded):
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return (
+        hasher.algorithm != preferred.algorithm
+        or preferred.must_update(encoded)
+    )
+
+
+class _OpStats:
+    __slots__ = ("count", "seconds_total", "seconds_max")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+
+
+class PasswordHashingPool:
+    """
+    Pool de processos para hash e verificação de senhas (PBKDF2).
+
+    O trabalho pesado de CPU sai da thread que atende a requisição e o
+    número de operações em andamento é limitado por `max_pending`: quando
+    o limite é atingido a requisição recebe 503 em vez de ocupar mais um
+    worker do WSGI/ASGI esperando na fila.
+
+    Com `workers=0` o hash roda na própria thread (mantendo o limite); nas
+    chamadas async, numa thread fora do event loop.
+    """
+
+    def __init__(self, workers=None, max_pending=None, acquire_timeout=None):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._acquire_timeout = acquire_timeout
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._stats = {"hash": _OpStats(), "verify": _OpStats()}
+        self._in_flight = 0
+        self._rejected = 0
+
+    def _config(self, key, default):
+        return getattr(settings, "PASSWORD_HASHING", {}).get(key, default)
+
+    @property
+    def workers(self):
+        if self._workers is None:
+            self._workers = self._config(
+                "WORKERS", min(4, os.cpu_count() or 1)
+            )
+        return self._workers
+
+    @property
+    def max_pending(self):
+        if self._max_pending is None:
+            self._max_pending = self._config(
+                "MAX_PENDING", max(self.workers, 1) * 4
+            )
+        return self._max_pending
+
+    @property
+    def acquire_timeout(self):
+        if self._acquire_timeout is None:
+            self._acquire_timeout = self._config("ACQUIRE_TIMEOUT", 2.0)
+        return self._acquire_timeout
+
+    def _get_executor(self):
+        with self._lock:
+            if self._slots is None:
+                self._slots = threading.BoundedSemaphore(self.max_pending)
+            if self._executor is None and self.workers > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def submit(self, op, fn, *args, block=True):
+        executor = self._get_executor()
+        # em código assíncrono não dá para esperar por uma vaga sem travar
+        # o event loop: sem vaga livre, recusa na hora
+        acquired = (
+            self._slots.acquire(timeout=self.acquire_timeout) if block
+            else self._slots.acquire(blocking=False)
+        )
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+            raise HashingPoolBusy()
+
+        with self._lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+
+        def done(_future):
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                stats = self._stats[op]
+                stats.count += 1
+                stats.seconds_total += elapsed
+                stats.seconds_max = max(stats.seconds_max, elapsed)
+            self._slots.release()
+
+        if executor is None:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = executor.submit(fn, *args)
+        future.add_done_callback(done)
+        return future
+
+    def make_password(self, raw_password):
+        return self.submit("hash", _make_password, raw_password).result()
+
+    def check_password(self, raw_password, encoded):
+        if not encoded or encoded.startswith(hashers.UNUSABLE_PASSWORD_PREFIX):
+            return False
+        return self.submit(
+            "verify", _check_password, raw_password, encoded
+        ).result()
+
+    async def _asubmit(self, op, fn, *args):
+        if self.workers > 0:
+            future = self.submit(op, fn, *args, block=False)
+            return await asyncio.wrap_future(future)
+        # sem processos o hash roda numa thread, fora do event loop
+        future = await sync_to_async(self.submit, thread_sensitive=False)(
+            op, fn, *args, block=False
+        )
+        return future.result()
+
+    async def amake_password(self, raw_password):
+        return await self._asubmit("hash", _make_password, raw_password)
+
+    async def acheck_password(self, raw_password, encoded):
+        if not encoded or encoded.startswith(hashers.UNUSABLE_PASSWORD_PREFIX):
+            return False
+        return await self._asubmit(
+            "verify", _check_password, raw_password, encoded
+        )
+
+    def metrics(self):
+        with self._lock:
+            data = {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "rejected_total": self._rejected,
+            }
+            for op, stats in self._stats.items():
+                data[f"{op}_total"] = stats.count
+                data[f"{op}_seconds_total"] = stats.seconds_total
+                data[f"{op}_seconds_max"] = stats.seconds_max
+        return data
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+hashing_pool = PasswordHashingPool()
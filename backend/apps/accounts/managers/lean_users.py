@@ -0,0 +1,91 @@
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.utils.encoding import filepath_to_uri
+
+from ..models import Usuario
+from .avatar import _format, _sizes, variant_name
+from .user_search import is_search
+
+# Colunas lidas pela listagem; o resto do UserSerializer é derivado delas.
+LIST_FIELDS = ("id", "username", "email", "avatar", "avatar_hash")
+
+
+def _has_dot_segment(path):
+    return any(part in (".", "..") for part in path.split("/"))
+
+
+class AvatarURLs:
+    """
+    Monta as URLs do storage como `FieldFile.url` / `variant_urls`, sem
+    instanciar FieldFile. No FileSystemStorage a URL é `base_url` (já
+    absoluta, se houver request) + o caminho: o prefixo é calculado uma
+    vez e cada linha custa só uma concatenação. Outros storages usam
+    `storage.url()`.
+    """
+
+    def __init__(self, request=None, storage=None):
+        self.storage = storage or default_storage
+        self.request = request
+        self.prefix = None
+
+        base_url = getattr(self.storage, "base_url", None)
+        if (
+            isinstance(self.storage, FileSystemStorage) and base_url
+            and not _has_dot_segment(base_url)
+        ):
+            if request is None:
+                self.prefix = base_url
+            elif base_url.startswith("/") and not base_url.startswith("//"):
+                self.prefix = request.build_absolute_uri(base_url)
+
+        _, self.variant_ext = _format()
+        self.sizes = _sizes()
+
+    def url(self, name):
+        if not name:
+            return None
+        path = filepath_to_uri(name).lstrip("/")
+        if self.prefix is not None and not _has_dot_segment(path):
+            return self.prefix + path
+        url = self.storage.url(name)
+        if self.request is not None:
+            url = self.request.build_absolute_uri(url)
+        return url
+
+    def variants(self, digest):
+        if not digest:
+            return None
+        return {
+            str(size): self.url(variant_name(digest, size, self.variant_ext))
+            for size in self.sizes
+        }
+
+
+def lean_rows(queryset):
+    """`values()` com as colunas da listagem (e a chave da busca, usada
+    pelo cursor)."""
+    fields = LIST_FIELDS
+    if is_search(queryset):
+        fields += ("search_key",)
+    return queryset.values(*fields)
+
+
+def serialize_users(rows, request=None):
+    """
+    Mesmo conteúdo de `UserSerializer(users, many=True).data`, a partir
+    das linhas de `lean_rows()`. Aceita qualquer iterável (ex.:
+    `.iterator()`), então páginas grandes não viram instâncias do modelo.
+    """
+    avatars = AvatarURLs(
+        request, Usuario._meta.get_field("avatar").storage
+    )
+    variants = AvatarURLs(request)
+    return [
+        {
+            "id": row["id"],
+            "username": row["username"],
+            "email": row["email"],
+            "avatar": avatars.url(row["avatar"]),
+            "avatar_variants": variants.variants(row["avatar_hash"]),
+        }
+        for row in rows
+    ]
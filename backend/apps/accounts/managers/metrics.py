@@ -0,0 +1,164 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# estatísticas de SQL da requisição em andamento (propaga entre
+# sync_to_async/async_to_sync, então funciona nas views async)
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestStats:
+    __slots__ = ("started", "queries", "db_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+def start_request():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def count_queries(execute, sql, params, many, context):
+    """`execute_wrapper` instalado em toda conexão (ver signals)."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield bound, total
+
+
+class _Series:
+    __slots__ = ("latency", "queries", "size", "db_seconds", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.db_seconds = 0.0
+        self.statuses = {}
+
+
+class MetricsRegistry:
+    """
+    Métricas por processo, rotuladas pelo nome da URL e pelo método.
+
+    Cada worker do gunicorn/uvicorn tem o seu registro; o Prometheus deve
+    raspar cada processo (ou somar as séries por `instance`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, view, method, status, stats, size):
+        elapsed = time.perf_counter() - stats.started
+        with self._lock:
+            series = self._series.get((view, method))
+            if series is None:
+                series = self._series[(view, method)] = _Series()
+            series.latency.observe(elapsed)
+            series.queries.observe(stats.queries)
+            series.db_seconds += stats.db_seconds
+            if size is not None:
+                series.size.observe(size)
+            series.statuses[status] = series.statuses.get(status, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self, extra=None):
+        """Formato texto do Prometheus (exposition format 0.0.4)."""
+        lines = []
+        with self._lock:
+            items = sorted(self._series.items())
+
+            lines.append("# TYPE http_requests_total counter")
+            for (view, method), series in items:
+                for status, count in sorted(series.statuses.items()):
+                    labels = _labels(view=view, method=method, status=status)
+                    lines.append(f"http_requests_total{{{labels}}} {count}")
+
+            for name, attr in (
+                ("http_request_duration_seconds", "latency"),
+                ("http_request_db_queries", "queries"),
+                ("http_response_size_bytes", "size"),
+            ):
+                lines.append(f"# TYPE {name} histogram")
+                for (view, method), series in items:
+                    _histogram(lines, name, getattr(series, attr),
+                               view=view, method=method)
+
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for (view, method), series in items:
+                labels = _labels(view=view, method=method)
+                lines.append(
+                    f"http_request_db_seconds_total{{{labels}}} "
+                    f"{series.db_seconds:.6f}"
+                )
+
+        for prefix, values in (extra or {}).items():
+            for key, value in values.items():
+                name = f"{prefix}_{key}"
+                kind = "counter" if key.endswith("_total") else "gauge"
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels):
+    return ",".join(
+        f'{key}="{str(value).replace(chr(34), "")}"'
+        for key, value in labels.items()
+    )
+
+
+def _histogram(lines, name, histogram, **labels):
+    base = _labels(**labels)
+    for bound, total in histogram.cumulative():
+        lines.append(f'{name}_bucket{{{base},le="{bound}"}} {total}')
+    lines.append(f"{name}_sum{{{base}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{base}}} {histogram.count}")
+
+
+request_metrics = MetricsRegistry()
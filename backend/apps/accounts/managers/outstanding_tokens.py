@@ -0,0 +1,146 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def buffering_enabled():
+    return getattr(settings, "OUTSTANDING_TOKEN_BUFFER", False)
+
+
+def _drop_missing_users(tokens):
+    # usuário removido antes do flush: mesma regra do FK (SET_NULL)
+    user_ids = {t.user_id for t in tokens if t.user_id is not None}
+    existing = set(
+        get_user_model().objects.filter(pk__in=user_ids)
+        .values_list("pk", flat=True)
+    )
+    for token in tokens:
+        if token.user_id not in existing:
+            token.user_id = None
+
+
+class OutstandingTokenBuffer:
+    """
+    Fila dos `OutstandingToken` de tokens emitidos neste processo.
+
+    Com `OUTSTANDING_TOKEN_BUFFER` ligado o login só enfileira o registro;
+    uma thread grava a fila com um `bulk_create` a cada `flush_interval`
+    segundos ou quando ela chega a `max_size` itens. O INSERT sai do
+    caminho do login.
+
+    Revogar um token ainda não gravado continua funcionando: o
+    `blacklist()` do simplejwt cria o `OutstandingToken` pelo JTI quando
+    ele não existe, e o `bulk_create` seguinte ignora a linha repetida.
+    """
+
+    def __init__(self, flush_interval=None, max_size=None):
+        self._flush_interval = flush_interval
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, "OUTSTANDING_TOKEN_FLUSH_INTERVAL", 1.0)
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, "OUTSTANDING_TOKEN_BUFFER_SIZE", 500)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, token):
+        with self._lock:
+            self._pending.append(token)
+            full = len(self._pending) >= self.max_size
+        self._start()
+        if full:
+            # quem grava é a thread, não a requisição que encheu a fila
+            self._wakeup.set()
+
+    def flush(self):
+        """Grava o que está na fila. Devolve quantos registros enviou."""
+        with self._flush_lock:
+            with self._lock:
+                tokens, self._pending = self._pending, []
+            if not tokens:
+                return 0
+            try:
+                self._write(tokens)
+            except Exception:
+                logger.exception(
+                    "Falha ao gravar %d outstanding tokens", len(tokens)
+                )
+                with self._lock:
+                    self._pending[:0] = tokens
+                raise
+            return len(tokens)
+
+    def _write(self, tokens):
+        from rest_framework_simplejwt.token_blacklist.models import (
+            OutstandingToken,
+        )
+
+        _drop_missing_users(tokens)
+        try:
+            with transaction.atomic():
+                OutstandingToken.objects.bulk_create(
+                    tokens, ignore_conflicts=True
+                )
+        except IntegrityError:
+            # usuário removido entre a checagem e o INSERT
+            _drop_missing_users(tokens)
+            with transaction.atomic():
+                OutstandingToken.objects.bulk_create(
+                    tokens, ignore_conflicts=True
+                )
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="outstanding-token-flush",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                # a fila foi mantida; tenta de novo no próximo ciclo
+                pass
+            finally:
+                close_old_connections()
+
+
+outstanding_tokens = OutstandingTokenBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    if len(outstanding_tokens):
+        try:
+            outstanding_tokens.flush()
+        except Exception:
+            pass
@@ -1,3 +1,6 @@
+import ipaddress
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission
 
 
@@ -6,3 +9,27 @@ class IsSuperUser(BasePermission):
 
     def has_permission(self, request, view):
         return bool(request.user and request.user.is_authenticated and request.user.is_superuser) # noqa E501
+
+
+def is_internal_ip(address):
+    try:
+        ip = ipaddress.ip_address(address or "")
+    except ValueError:
+        return False
+    return any(
+        ip in ipaddress.ip_network(network)
+        for network in getattr(settings, "METRICS_ALLOWED_NETWORKS", ())
+    )
+
+
+class IsSuperUserOrInternalIP(BasePermission):
+    """
+    Super usuários ou chamadas vindas das redes internas configuradas.
+    Usa REMOTE_ADDR (o endereço de quem conectou), nunca X-Forwarded-For.
+    """
+    message = IsSuperUser.message
+
+    def has_permission(self, request, view):
+        if is_internal_ip(request.META.get("REMOTE_ADDR")):
+            return True
+        return IsSuperUser().has_permission(request, view)
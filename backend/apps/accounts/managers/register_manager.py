@@ -1,8 +1,35 @@
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
 from rest_framework.exceptions import ValidationError
+from .avatar import process_avatar
+from .hashing import hashing_pool
 from ..models import Usuario
 
+# Mensagem de cada campo único, pela restrição que o banco violou.
+UNIQUE_ERRORS = {
+    "email": "Este email já está registrado.",
+    "username": "Este username já está registrado.",
+}
+
+
+def unique_violation_errors(exc):
+    """
+    Erros por campo para o IntegrityError de um INSERT de usuário, ou
+    None se não for uma das restrições únicas conhecidas.
+
+    No Postgres o nome da restrição vem no diagnóstico do driver
+    (accounts_usuario_email_lower_uniq, accounts_usuario_username_key);
+    no SQLite só na mensagem.
+    """
+    diag = getattr(exc.__cause__, "diag", None)
+    name = getattr(diag, "constraint_name", None) or str(exc)
+    for field, message in UNIQUE_ERRORS.items():
+        if field in name:
+            return {field: [message]}
+    return None
+
 
 class RegisterManager:
     @staticmethod
@@ -15,11 +42,25 @@ class RegisterManager:
                 {"password2": ["As senhas não correspondem."]}
             )
 
-        email = data.get("email", "").strip()
-        if Usuario.objects.filter(email=email).exists():
+        # mesma normalização do create_user; vazio não chega ao INSERT
+        username = Usuario.normalize_username(
+            str(data.get("username") or "").strip()
+        )
+        if not username:
             raise ValidationError(
-                {"email": ["Este email já está registrado."]}
+                {"username": ["Este campo é obrigatório."]}
             )
+        data["username"] = username
+
+        try:
+            validate_email(Usuario.objects.normalize_email(data.get("email")))
+        except DjangoValidationError:
+            raise ValidationError(
+                {"email": ["Informe um endereço de email válido."]}
+            )
+
+        # email e username repetidos são barrados pelas restrições únicas
+        # no INSERT (ver `create`), sem consulta prévia
 
         if len(password) < 8:
             raise ValidationError(
@@ -38,16 +79,29 @@ class RegisterManager:
         avatar = data.pop("avatar", None)
         data.pop("password2", None)
 
-        user = Usuario.objects.create_user(
-            username=data["username"],
-            email=data["email"],
-        )
-        user.set_password(data["password"])
+        if isinstance(avatar, list):
+            avatar = avatar[0] if avatar else None
 
-        if avatar:
-            if isinstance(avatar, list):
-                avatar = avatar[0]
-            user.avatar = avatar
+        # hash calculado fora da thread da requisição; o usuário é criado
+        # com um único INSERT já com a senha definitiva
+        password = hashing_pool.make_password(data["password"])
 
-        user.save()
+        user = Usuario(
+            username=Usuario.normalize_username(data["username"]),
+            email=Usuario.objects.normalize_email(data["email"]),
+            password=password,
+            avatar=avatar or "",
+            avatar_hash=process_avatar(avatar) if avatar else "",
+        )
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+        except IntegrityError as e:
+            errors = unique_violation_errors(e)
+            if errors is None:
+                raise
+            if user.avatar:
+                # o arquivo já foi gravado antes do INSERT
+                user.avatar.delete(save=False)
+            raise ValidationError(errors)
         return user
@@ -0,0 +1,226 @@
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _jti_hash(jti):
+    digest = hashlib.blake2b(str(jti).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class RevokedTokenIndex:
+    """
+    Índice em memória dos JTIs de refresh tokens revogados.
+
+    Guarda apenas um hash de 64 bits de cada JTI (com a expiração do
+    token). Um JTI ausente do índice certamente não está na blacklist; um
+    JTI presente é só um "possível" revogado e precisa ser confirmado no
+    banco. Assim a maioria das verificações não toca nas tabelas do
+    `token_blacklist`.
+
+    O índice é carregado do banco no primeiro uso, recebe os tokens
+    revogados neste processo na hora (sinal `post_save`) e busca os
+    revogados por outros processos no máximo a cada `sync_interval`
+    segundos, paginando pelas linhas novas da blacklist. Um token
+    revogado em outro processo continua aceito aqui por até esse
+    intervalo (0 = sincroniza a cada verificação).
+
+    Ids pulados na leitura (transação ainda aberta ou desfeita) são
+    relidos por `gap_timeout` segundos. A cada `reload_interval` segundos
+    o índice é recarregado do zero: entradas de tokens expirados ou
+    removidos da blacklist (`prune_expired_tokens`) saem da memória.
+    """
+
+    page_size = 5000
+    gap_timeout = 60
+
+    def __init__(self, sync_interval=None, reload_interval=None,
+                 clock=time.monotonic):
+        self._sync_interval = sync_interval
+        self._reload_interval = reload_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        # protege as escritas em `_hashes`; `_lock` fica com a
+        # sincronização inteira, que inclui as consultas ao banco
+        self._write_lock = threading.Lock()
+        self._hashes = {}
+        self._last_id = 0
+        self._gaps = []
+        self._synced_at = None
+        self._loaded_at = None
+
+    @property
+    def sync_interval(self):
+        if self._sync_interval is not None:
+            return self._sync_interval
+        return getattr(settings, "REVOCATION_SYNC_INTERVAL", 2.0)
+
+    @property
+    def reload_interval(self):
+        if self._reload_interval is not None:
+            return self._reload_interval
+        return getattr(settings, "REVOCATION_RELOAD_INTERVAL", 600.0)
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, jti, expires_at=None):
+        with self._write_lock:
+            self._hashes[_jti_hash(jti)] = expires_at
+
+    def might_contain(self, jti):
+        self.sync()
+        return _jti_hash(jti) in self._hashes
+
+    def reset(self):
+        with self._lock, self._write_lock:
+            self._hashes = {}
+            self._last_id = 0
+            self._gaps = []
+            self._synced_at = None
+            self._loaded_at = None
+
+    def sync(self, force=False):
+        synced_at = self._synced_at
+        if not force and synced_at is not None:
+            if self._clock() - synced_at < self.sync_interval:
+                return
+
+        # se outra thread já está sincronizando, usa o índice atual
+        blocking = synced_at is None or force
+        if not self._lock.acquire(blocking=blocking):
+            return
+        try:
+            if not force and self._synced_at != synced_at:
+                return
+            now = self._clock()
+            if (self._loaded_at is None
+                    or now - self._loaded_at >= self.reload_interval):
+                self._reload()
+                self._loaded_at = now
+            else:
+                self._load_new(now)
+            self._synced_at = self._clock()
+        finally:
+            self._lock.release()
+
+    def _rows(self):
+        from rest_framework_simplejwt.token_blacklist.models import (
+            BlacklistedToken,
+        )
+
+        return BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).order_by("id").values_list("id", "token__jti", "token__expires_at")
+
+    def _reload(self):
+        hashes = {}
+        last_id = 0
+        for row_id, jti, expires_at in self._rows().iterator(
+            chunk_size=self.page_size
+        ):
+            hashes[_jti_hash(jti)] = expires_at
+            last_id = max(last_id, row_id)
+        # entradas que o banco ainda não mostrou (revogadas neste processo
+        # numa transação aberta ou durante a leitura acima) ficam até o
+        # token expirar
+        now = timezone.now()
+        with self._write_lock:
+            for h, exp in self._hashes.items():
+                if h not in hashes and (exp is None or exp > now):
+                    hashes[h] = exp
+            self._hashes = hashes
+        self._last_id = max(last_id, self._last_id)
+
+    def _load_new(self, now):
+        self._gaps = [
+            gap for gap in self._gaps if now - gap[2] < self.gap_timeout
+        ]
+        if self._gaps:
+            missing = Q()
+            for low, high, _ in self._gaps:
+                missing |= Q(id__range=(low, high))
+            for row_id, jti, expires_at in self._rows().filter(missing):
+                self.add(jti, expires_at)
+                self._gaps = _remove_id(self._gaps, row_id)
+
+        while True:
+            page = list(
+                self._rows().filter(id__gt=self._last_id)[:self.page_size]
+            )
+            for row_id, jti, expires_at in page:
+                self.add(jti, expires_at)
+                if row_id > self._last_id + 1:
+                    self._gaps.append((self._last_id + 1, row_id - 1, now))
+                self._last_id = row_id
+            if len(page) < self.page_size:
+                break
+
+
+def _remove_id(gaps, row_id):
+    result = []
+    for low, high, seen_at in gaps:
+        if not low <= row_id <= high:
+            result.append((low, high, seen_at))
+            continue
+        if low < row_id:
+            result.append((low, row_id - 1, seen_at))
+        if row_id < high:
+            result.append((row_id + 1, high, seen_at))
+    return result
+
+
+revoked_tokens = RevokedTokenIndex()
+
+
+def blacklist_user_tokens(user_ids):
+    """
+    Revoga de uma vez os refresh tokens ainda válidos dos usuários: um
+    SELECT e um INSERT em lote na blacklist. Devolve quantos revogou.
+
+    Só alcança os tokens que já têm registro em OutstandingToken. Os
+    emitidos por outros processos e ainda na fila deles (até
+    OUTSTANDING_TOKEN_FLUSH_INTERVAL) não têm: para esses vale a versão
+    dos tokens, que quem revoga incrementa (ver BatchUserManager e
+    Usuario.revoke_tokens) e que o refresh confere pelo claim "ver".
+    """
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken, OutstandingToken,
+    )
+    from apps.accounts.managers.outstanding_tokens import outstanding_tokens
+
+    # tokens emitidos aqui e ainda na fila também entram na blacklist; se
+    # a gravação falhar eles continuam na fila e a revogação segue pela
+    # versão
+    if len(outstanding_tokens):
+        try:
+            with transaction.atomic():
+                outstanding_tokens.flush()
+        except Exception:
+            logger.warning(
+                "Fila de outstanding tokens não gravada; tokens na fila são "
+                "revogados pela versão."
+            )
+    tokens = list(
+        OutstandingToken.objects.filter(
+            user_id__in=user_ids,
+            expires_at__gt=timezone.now(),
+            blacklistedtoken__isnull=True,
+        ).values_list("id", "jti", "expires_at")
+    )
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=token_id) for token_id, _, _ in tokens],
+        ignore_conflicts=True,
+    )
+    # bulk_create não dispara post_save: atualiza o índice deste processo
+    for _, jti, expires_at in tokens:
+        revoked_tokens.add(jti, expires_at)
+    return len(tokens)
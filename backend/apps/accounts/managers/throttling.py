@@ -0,0 +1,189 @@
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60), no mesmo formato das taxas do DRF."""
+    if not rate:
+        return None, None
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+class LocalWindowStore:
+    """
+    Janela deslizante em memória do processo: um deque de instantes por
+    chave. Não faz I/O; com vários workers cada um tem o seu limite.
+    """
+
+    def __init__(self, max_keys=100_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._max_window = 0
+
+    def hit(self, key, limit, window):
+        """Registra a tentativa; devolve None ou os segundos de espera."""
+        now = self._clock()
+        with self._lock:
+            self._max_window = max(self._max_window, window)
+            history = self._entries.get(key)
+            if history is None:
+                if len(self._entries) >= self.max_keys:
+                    self._sweep(now)
+                history = self._entries[key] = deque()
+
+            while history and history[0] <= now - window:
+                history.popleft()
+            if len(history) >= limit:
+                return history[0] + window - now
+            history.append(now)
+            return None
+
+    def _sweep(self, now):
+        expired = [
+            key for key, history in self._entries.items()
+            if not history or history[-1] <= now - self._max_window
+        ]
+        for key in expired:
+            del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheWindowStore:
+    """
+    Mesma janela no cache do Django, compartilhada entre os processos
+    quando o cache é Redis/Memcached.
+
+    A janela é dividida em `buckets` sub-janelas, cada uma com um contador
+    (`cache.add` + `cache.incr`, atômicos no backend). A tentativa é
+    contada antes de comparar com o limite: tentativas simultâneas recebem
+    valores distintos do incr, e passam no máximo `limit`. A janela é
+    arredondada para cima em uma sub-janela.
+    """
+
+    def __init__(self, alias="default", clock=time.time, buckets=10):
+        self.alias = alias
+        self._clock = clock
+        self.buckets = buckets
+
+    def hit(self, key, limit, window):
+        cache = caches[self.alias]
+        now = self._clock()
+        size = window / self.buckets
+        current = int(now // size)
+        first = int((now - window) // size)
+        keys = {
+            index: f"accounts:throttle:{key}:{index}"
+            for index in range(first, current + 1)
+        }
+        timeout = math.ceil(window + size)
+
+        count = self._incr(cache, keys[current], timeout)
+        counts = cache.get_many([keys[i] for i in range(first, current)])
+        if count + sum(counts.values()) <= limit:
+            return None
+
+        # negada não conta, como no store local
+        cache.decr(keys[current])
+        oldest = next(
+            (i for i in range(first, current) if counts.get(keys[i])),
+            current,
+        )
+        return (oldest + 1) * size + window - now
+
+    def _incr(self, cache, cache_key, timeout):
+        while True:
+            cache.add(cache_key, 0, timeout)
+            try:
+                return cache.incr(cache_key)
+            except ValueError:
+                # expirou entre o add e o incr
+                continue
+
+
+local_store = LocalWindowStore()
+
+
+def get_store():
+    if getattr(settings, "LOGIN_THROTTLE_STORE", "local") == "cache":
+        return CacheWindowStore()
+    return local_store
+
+
+def _digest(value):
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+class CredentialThrottle(BaseThrottle):
+    """
+    Limita tentativas de login por IP e por e-mail antes de qualquer
+    consulta ao banco ou hash de senha. Se o IP já estourou o limite, o
+    e-mail nem é contado (um IP não consegue encher o store de chaves).
+
+    As taxas vêm de `DEFAULT_THROTTLE_RATES` (escopos `ip_scope` e
+    `email_scope`).
+    """
+
+    ip_scope = "login_ip"
+    email_scope = "login_email"
+    email_field = "email"
+
+    def __init__(self):
+        self._wait = None
+
+    def allow_request(self, request, view):
+        if not getattr(settings, "LOGIN_THROTTLE_ENABLED", True):
+            return True
+
+        store = get_store()
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+
+        limit, window = parse_rate(rates.get(self.ip_scope))
+        if limit is not None:
+            key = f"{self.ip_scope}:{self.get_ident(request)}"
+            self._wait = store.hit(key, limit, window)
+            if self._wait is not None:
+                return False
+
+        limit, window = parse_rate(rates.get(self.email_scope))
+        email = self.get_email(request)
+        if limit is not None and email:
+            key = f"{self.email_scope}:{_digest(email)}"
+            self._wait = store.hit(key, limit, window)
+            if self._wait is not None:
+                return False
+
+        return True
+
+    def get_email(self, request):
+        if not self.email_field:
+            return None
+        data = request.data
+        value = data.get(self.email_field) if hasattr(data, "get") else None
+        if not isinstance(value, str):
+            return None
+        return value.strip().lower()
+
+    def wait(self):
+        return self._wait
+
+
+class GoogleAuthThrottle(CredentialThrottle):
+    ip_scope = "google_ip"
+    email_scope = None
+    email_field = None
@@ -0,0 +1,55 @@
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+
+def prune_expired_tokens(
+    batch_size=1000, max_batches=None, max_seconds=None, pause=0.0,
+    cutoff=None, clock=time.monotonic, sleep=time.sleep,
+):
+    """
+    Remove os refresh tokens expirados (OutstandingToken e a entrada da
+    blacklist, se houver) em lotes de `batch_size`.
+
+    Cada lote é uma transação curta: escolhe os ids pela chave primária
+    (os tokens mais antigos expiram primeiro, então a busca para logo),
+    pulando linhas travadas por outra transação, e apaga. Interromper no
+    meio não perde nada: a próxima execução continua de onde parou.
+
+    Devolve um dict com as linhas removidas de cada tabela, os lotes e os
+    segundos gastos.
+    """
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken, OutstandingToken,
+    )
+
+    cutoff = cutoff or timezone.now()
+    started = clock()
+    result = {"outstanding": 0, "blacklisted": 0, "batches": 0}
+
+    while max_batches is None or result["batches"] < max_batches:
+        with transaction.atomic():
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lt=cutoff)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            _, deleted = OutstandingToken.objects.filter(id__in=ids).delete()
+
+        result["batches"] += 1
+        result["outstanding"] += deleted.get(OutstandingToken._meta.label, 0)
+        result["blacklisted"] += deleted.get(BlacklistedToken._meta.label, 0)
+        if len(ids) < batch_size:
+            break
+        if max_seconds is not None and clock() - started >= max_seconds:
+            break
+        if pause:
+            # dá espaço para as escritas do tráfego normal
+            sleep(pause)
+
+    result["seconds"] = clock() - started
+    return result
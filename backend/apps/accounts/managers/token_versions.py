@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_KEY = "accounts:token_version:{}"
+
+# usuário removido: nenhum token tem essa versão
+DELETED = -1
+
+
+def _timeout():
+    return getattr(settings, "TOKEN_VERSION_CACHE_TIMEOUT", 60)
+
+
+def get_token_version(user_id):
+    """
+    Versão atual dos tokens do usuário. Lida do cache; o banco só é
+    consultado quando a entrada não existe ou expirou.
+    """
+    key = CACHE_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            get_user_model().objects.filter(pk=user_id)
+            .values_list("token_version", flat=True).first()
+        )
+        if version is None:
+            version = DELETED
+        cache.set(key, version, _timeout())
+    return version
+
+
+async def aget_token_version(user_id):
+    key = CACHE_KEY.format(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = await (
+            get_user_model().objects.filter(pk=user_id)
+            .values_list("token_version", flat=True).afirst()
+        )
+        if version is None:
+            version = DELETED
+        await cache.aset(key, version, _timeout())
+    return version
+
+
+def forget_token_version(user_id):
+    key = CACHE_KEY.format(user_id)
+    cache.delete(key)
+    # uma leitura concorrente pode ter recolocado a versão antiga no cache
+    # antes do commit; apaga de novo quando a transação terminar
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def forget_token_versions(user_ids):
+    keys = [CACHE_KEY.format(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
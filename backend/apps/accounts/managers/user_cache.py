@@ -0,0 +1,151 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+from apps.accounts.apis.serializers import UserSerializer
+from apps.accounts.models import Usuario
+
+# Suba quando o formato do UserSerializer mudar: as entradas antigas
+# deixam de ser lidas e expiram sozinhas.
+PAYLOAD_VERSION = 1
+
+CACHE_KEY = "accounts:user_payload:v{}:{}"
+
+
+def _key(user_id):
+    return CACHE_KEY.format(PAYLOAD_VERSION, user_id)
+
+
+def _timeout():
+    return getattr(settings, "USER_PAYLOAD_CACHE_TIMEOUT", 300)
+
+
+def caching_enabled():
+    """
+    Só com cache compartilhado entre os processos (Redis/Memcached): a
+    invalidação ao salvar apaga a entrada no cache de quem salvou, e com
+    LocMem os outros workers continuariam servindo o payload antigo (e
+    respondendo 304 para o ETag antigo). USER_PAYLOAD_CACHE_LOCAL libera o
+    LocMem quando há um único processo.
+    """
+    if _timeout() <= 0:
+        return False
+    if isinstance(caches["default"], (LocMemCache, DummyCache)):
+        return getattr(settings, "USER_PAYLOAD_CACHE_LOCAL", False)
+    return True
+
+
+def build_entry(user):
+    """Payload serializado do usuário, com ETag e Last-Modified."""
+    data = dict(UserSerializer(user).data)
+    body = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder
+    )
+    updated_at = getattr(user, "updated_at", None)
+    return {
+        "data": data,
+        "etag": '"%s"' % hashlib.blake2b(
+            body.encode(), digest_size=16
+        ).hexdigest(),
+        "last_modified": (
+            int(updated_at.timestamp()) if updated_at is not None else None
+        ),
+    }
+
+
+def get_cached_entry(user_id):
+    if not caching_enabled():
+        return None
+    return cache.get(_key(user_id))
+
+
+def cache_entry(user):
+    entry = build_entry(user)
+    if caching_enabled():
+        cache.set(_key(user.id), entry, _timeout())
+    return entry
+
+
+def user_entry(user_id):
+    """Entrada do cache ou, na falta, uma query + serialização."""
+    entry = get_cached_entry(user_id)
+    if entry is None:
+        user = Usuario.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        entry = cache_entry(user)
+    return entry
+
+
+async def aget_cached_entry(user_id):
+    if not caching_enabled():
+        return None
+    return await cache.aget(_key(user_id))
+
+
+async def acache_entry(user):
+    entry = build_entry(user)
+    if caching_enabled():
+        await cache.aset(_key(user.id), entry, _timeout())
+    return entry
+
+
+async def auser_entry(user_id):
+    entry = await aget_cached_entry(user_id)
+    if entry is None:
+        user = await Usuario.objects.filter(pk=user_id).afirst()
+        if user is None:
+            return None
+        entry = await acache_entry(user)
+    return entry
+
+
+def forget_user_payload(user_id):
+    key = _key(user_id)
+    cache.delete(key)
+    # uma leitura concorrente pode ter gravado o payload antigo antes do
+    # commit; apaga de novo quando a transação terminar
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def forget_user_payloads(user_ids):
+    keys = [_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _etag(request, entry):
+    # o mesmo payload renderizado como JSON ou pela API navegável são
+    # representações diferentes: cada media type tem o seu ETag
+    media_type = getattr(request, "accepted_media_type", None)
+    if not media_type or media_type == "application/json":
+        return entry["etag"]
+    return '"%s"' % hashlib.blake2b(
+        f"{entry['etag']}:{media_type}".encode(), digest_size=16
+    ).hexdigest()
+
+
+def conditional_response(request, entry):
+    """200 com ETag/Last-Modified ou 304 se o cliente já tem a versão."""
+    etag = _etag(request, entry)
+    response = Response(entry["data"])
+    response["ETag"] = etag
+    if entry["last_modified"] is not None:
+        response["Last-Modified"] = http_date(entry["last_modified"])
+    # o navegador pode guardar, mas sempre revalida (If-None-Match)
+    response["Cache-Control"] = "private, no-cache"
+    patch_vary_headers(response, ["Accept"])
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=entry["last_modified"],
+        response=response,
+    )
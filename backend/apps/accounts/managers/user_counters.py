@@ -0,0 +1,189 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.utils import timezone
+
+from ..models import UserCounters, Usuario
+
+COUNTERS_ID = 1
+
+# Filtros da listagem que os contadores respondem sem COUNT(*).
+COUNTED_FILTERS = (
+    (Q(), lambda c: c.total),
+    (Q(is_active=True), lambda c: c.active),
+    (Q(is_active=False), lambda c: c.total - c.active),
+    (Q(is_superuser=True), lambda c: c.superusers),
+    (Q(is_superuser=False), lambda c: c.total - c.superusers),
+)
+
+_suspended = contextvars.ContextVar("user_counters_suspended", default=False)
+
+
+def apply_delta(total=0, active=0, superusers=0, using=None):
+    """
+    Soma a variação na linha de UserCounters. Deve ser chamada dentro da
+    transação que alterou os usuários: Usuario.save abre uma em volta do
+    post_save, o delete envia o post_delete dentro da sua, e
+    `counted_update`, o lote e a importação usam transaction.atomic. Se a
+    variação falhar a escrita volta junto; o UPDATE trava a linha até o
+    commit.
+    """
+    deltas = {"total": total, "active": active, "superusers": superusers}
+    changes = {
+        name: F(name) + value for name, value in deltas.items() if value
+    }
+    if changes:
+        UserCounters.objects.db_manager(using).filter(pk=COUNTERS_ID).update(
+            updated_at=timezone.now(), **changes
+        )
+
+
+@contextmanager
+def counters_suspended():
+    """
+    Os sinais de save/delete não mexem nos contadores dentro do bloco;
+    usado por operações em lote, que aplicam uma única variação.
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def _flag_sums(queryset):
+    return queryset.aggregate(
+        active=Count("id", filter=Q(is_active=True)),
+        superusers=Count("id", filter=Q(is_superuser=True)),
+    )
+
+
+def counted_update(queryset, values):
+    """
+    `queryset.update(**values)` quando muda um campo contado (update() não
+    dispara sinais). As linhas ficam travadas e a variação é medida antes
+    e depois, tudo na mesma transação.
+    """
+    if _suspended.get():
+        return QuerySet.update(queryset, **values)
+    using = queryset.db
+    with transaction.atomic(using=using):
+        ids = list(queryset.select_for_update().values_list("pk", flat=True))
+        rows = Usuario._base_manager.db_manager(using).filter(pk__in=ids)
+        before = _flag_sums(rows)
+        updated = rows.update(**values)
+        after = _flag_sums(rows)
+        apply_delta(
+            using=using, **{name: after[name] - before[name] for name in after}
+        )
+    return updated
+
+
+def user_saved(user, created, using=None):
+    new = user._get_counted_flags()
+    if created:
+        old = dict.fromkeys(("total", "active", "superusers"), 0)
+    else:
+        old = getattr(user, "_counted_flags", None)
+    user._counted_flags = new
+    if _suspended.get() or old is None or new is None:
+        # estado anterior desconhecido: o reconcile corrige se divergir
+        return
+    apply_delta(using=using, **{name: new[name] - old[name] for name in new})
+
+
+def user_deleted(user, using=None):
+    if _suspended.get():
+        return
+    flags = getattr(user, "_counted_flags", None) or user._get_counted_flags()
+    if flags is not None:
+        apply_delta(using=using, **{n: -value for n, value in flags.items()})
+
+
+def counted(queryset):
+    """Função que lê a contagem de `queryset` em UserCounters, se houver."""
+    query = queryset.query
+    if (
+        queryset.model is not Usuario or query.is_sliced
+        or query.combinator or query.distinct
+    ):
+        return None
+    for condition, read in COUNTED_FILTERS:
+        if query.where == Usuario.objects.filter(condition).query.where:
+            return read
+    return None
+
+
+def estimated_total(using):
+    """Estimativa do planner (pg_class.reltuples); None fora do Postgres."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [Usuario._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # -1: tabela ainda não analisada (VACUUM/ANALYZE)
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def count_users(queryset):
+    """
+    `queryset.count()` respondido pelos contadores quando possível.
+
+    USER_COUNT_MODE: 'counters' (padrão), 'estimate' (total sem filtro
+    pela estimativa do Postgres) ou 'exact' (sempre COUNT(*)).
+    """
+    mode = getattr(settings, "USER_COUNT_MODE", "counters")
+    read = counted(queryset) if mode != "exact" else None
+    if read is None:
+        return queryset.count()
+
+    if mode == "estimate" and read is COUNTED_FILTERS[0][1]:
+        estimate = estimated_total(queryset.db)
+        if estimate is not None:
+            return estimate
+
+    counters = UserCounters.objects.using(queryset.db).filter(
+        pk=COUNTERS_ID
+    ).first()
+    if counters is None:
+        return queryset.count()
+    return max(read(counters), 0)
+
+
+def reconcile(using=None):
+    """
+    Recalcula os contadores a partir da tabela de usuários. Devolve as
+    contagens reais e a diferença corrigida em cada coluna.
+
+    A linha fica travada enquanto conta: quem gravar um usuário nesse
+    meio tempo espera o commit para aplicar a sua variação, que então
+    entra sobre o valor já corrigido.
+    """
+    with transaction.atomic(using=using):
+        counters, _ = (
+            UserCounters.objects.db_manager(using).select_for_update()
+            .get_or_create(pk=COUNTERS_ID)
+        )
+        actual = Usuario.objects.db_manager(using).aggregate(
+            total=Count("id"),
+            active=Count("id", filter=Q(is_active=True)),
+            superusers=Count("id", filter=Q(is_superuser=True)),
+        )
+        drift = {
+            name: value - getattr(counters, name)
+            for name, value in actual.items()
+        }
+        if any(drift.values()):
+            UserCounters.objects.db_manager(using).filter(
+                pk=COUNTERS_ID
+            ).update(updated_at=timezone.now(), **actual)
+    return actual, drift
@@ -0,0 +1,97 @@
+import csv
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .lean_users import AvatarURLs
+
+EXPORT_FIELDS = [
+    "id", "username", "email", "avatar", "is_active", "is_superuser",
+    "date_joined", "last_login",
+]
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+class UserExportManager:
+    """
+    Exporta usuários linha a linha. Lê `values_list()` com
+    `.iterator(chunk_size=...)` (cursor no servidor no Postgres), então a
+    memória usada não depende do tamanho da tabela.
+
+    `astream` é a versão async, para respostas servidas via ASGI: o
+    Django consumiria um iterador síncrono inteiro em memória antes de
+    enviar.
+    """
+
+    def __init__(self, queryset, chunk_size=2000):
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+
+    def _values(self):
+        return self.queryset.order_by("id").values_list(*EXPORT_FIELDS)
+
+    def _row_formatter(self):
+        media_url = AvatarURLs().url
+        avatar_index = EXPORT_FIELDS.index("avatar")
+
+        def format_row(row):
+            row = list(row)
+            row[avatar_index] = (
+                media_url(row[avatar_index]) if row[avatar_index] else None
+            )
+            return row
+        return format_row
+
+    def rows(self):
+        format_row = self._row_formatter()
+        for row in self._values().iterator(chunk_size=self.chunk_size):
+            yield format_row(row)
+
+    async def arows(self):
+        # o `aiterator()` de values_list() executa a consulta fora de
+        # sync_to_async; aqui o iterador síncrono é lido em blocos de
+        # `chunk_size`, sempre na mesma thread (cursor no servidor)
+        rows = self.rows()
+        take = sync_to_async(lambda: list(islice(rows, self.chunk_size)))
+        try:
+            while chunk := await take():
+                for row in chunk:
+                    yield row
+        finally:
+            await sync_to_async(rows.close)()
+
+    def _encoder(self, fmt):
+        """(linhas de cabeçalho, função que codifica uma linha)."""
+        if fmt == "csv":
+            writer = csv.writer(_Echo())
+            return [writer.writerow(EXPORT_FIELDS)], lambda row: (
+                writer.writerow("" if value is None else value
+                                for value in row)
+            )
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        return [], lambda row: (
+            encoder.encode(dict(zip(EXPORT_FIELDS, row))) + "\n"
+        )
+
+    def stream(self, fmt):
+        header, encode = self._encoder(fmt)
+        yield from header
+        for row in self.rows():
+            yield encode(row)
+
+    async def astream(self, fmt):
+        header, encode = self._encoder(fmt)
+        for line in header:
+            yield line
+        async for row in self.arows():
+            yield encode(row)
@@ -0,0 +1,81 @@
+from django.db import connections
+from django.db.models import BigIntegerField, Case, F, Q, Value, When
+
+# termos menores que isso não aproveitam o índice trigram: busca por prefixo
+TRIGRAM_MIN_LENGTH = 3
+
+# search_key = rank * STRIDE - id: uma única coluna ordenável e única por
+# linha (rank asc, id desc), o que a paginação por cursor exige
+STRIDE = 10 ** 15
+
+RANK_EXACT, RANK_PREFIX, RANK_CONTAINS = 0, 1, 2
+
+# mesmos índices da migration 0005
+SQLITE_SEARCH_INDEXES = (
+    ("accounts_usuario_username_nocase", "(username COLLATE NOCASE)"),
+    ("accounts_usuario_email_nocase", "(email COLLATE NOCASE)"),
+)
+
+
+def search_lookup(queryset, term):
+    """
+    `icontains` no Postgres (índice GIN trigram em UPPER(coluna)) ou
+    `istartswith` (índice de prefixo) para termos curtos e no SQLite,
+    onde `%termo%` sempre varre a tabela.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql" and len(term) >= TRIGRAM_MIN_LENGTH:
+        return "icontains"
+    return "istartswith"
+
+
+def search_users(queryset, term):
+    """Filtra por username/e-mail e anota `search_rank`/`search_key`."""
+    term = (term or "").strip()
+    if not term:
+        return queryset
+
+    lookup = search_lookup(queryset, term)
+    match = (
+        Q(**{f"username__{lookup}": term})
+        | Q(**{f"email__{lookup}": term})
+    )
+    rank = Case(
+        When(Q(username__iexact=term) | Q(email__iexact=term),
+             then=Value(RANK_EXACT)),
+        When(Q(username__istartswith=term) | Q(email__istartswith=term),
+             then=Value(RANK_PREFIX)),
+        default=Value(RANK_CONTAINS),
+        output_field=BigIntegerField(),
+    )
+    return queryset.filter(match).annotate(
+        search_rank=rank,
+        search_key=F("search_rank") * STRIDE - F("id"),
+    )
+
+
+def is_search(queryset):
+    return "search_key" in queryset.query.annotations
+
+
+def order_users(queryset):
+    """Mais relevantes primeiro na busca; senão, mais novos primeiro."""
+    return queryset.order_by("search_key" if is_search(queryset) else "-id")
+
+
+def ensure_sqlite_search_indexes(connection):
+    """
+    O SQLite recria a tabela a cada alteração de coluna e só copia os
+    índices que o Django conhece; os de busca (SQL puro) são recriados
+    depois de cada migrate.
+    """
+    if connection.vendor != "sqlite":
+        return
+    if "accounts_usuario" not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        for name, definition in SQLITE_SEARCH_INDEXES:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} "
+                f"ON accounts_usuario {definition}"
+            )
@@ -0,0 +1,112 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from core.db_router import apin_primary, pin_primary, replicas
+from apps.accounts.managers.metrics import end_request, request_metrics, start_request # noqa E501
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+HTTP_METHODS = frozenset(
+    ("get", "post", "put", "patch", "delete", "head", "options", "trace")
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Latência, número/tempo de queries e tamanho da resposta de cada
+    requisição, agrupados pelo nome da URL (`auth-login`, `me`, ...).
+    Expostos em `/metrics`.
+
+    Atende views síncronas e async sem trocar de thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "METRICS_ENABLED", True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats, token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        self.observe(request, response, stats)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        stats, token = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        self.observe(request, response, stats)
+        return response
+
+    def observe(self, request, response, stats):
+        match = request.resolver_match
+        # rotas sem nome/404 viram um único rótulo, para não explodir a
+        # cardinalidade com URLs arbitrárias
+        view = match.url_name if match and match.url_name else "unmatched"
+        method = request.method
+        if method.lower() not in HTTP_METHODS:
+            method = "OTHER"
+        size = None if response.streaming else len(response.content)
+        request_metrics.observe(
+            view, method, response.status_code, stats, size
+        )
+
+
+class ReplicaPinMiddleware:
+    """
+    Depois de uma escrita bem-sucedida (método não seguro), prende o
+    usuário autenticado ao banco principal por REPLICA_PIN_SECONDS: as
+    próximas leituras dele não vão para uma réplica ainda atrasada.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        user_id = self.writer_id(request, response)
+        if user_id is not None:
+            pin_primary(user_id)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        user_id = self.writer_id(request, response)
+        if user_id is not None:
+            await apin_primary(user_id)
+        return response
+
+    @staticmethod
+    def writer_id(request, response):
+        if not replicas() or request.method in SAFE_METHODS:
+            return None
+        if response.status_code >= 400:
+            return None
+        # com JWT o usuário é definido pelo DRF dentro da view
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user.pk
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-18 09:41
+
+import apps.accounts.models
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='usuario',
+            managers=[
+                ('objects', apps.accounts.models.UsuarioManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='usuario',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='accounts_usuario_email_lower_uniq'),
+        ),
+    ]
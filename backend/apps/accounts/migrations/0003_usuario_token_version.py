@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_usuario_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_usuario_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='avatar_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
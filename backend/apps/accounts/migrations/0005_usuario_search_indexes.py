@@ -0,0 +1,74 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:20
+
+from django.db import migrations
+
+# Busca em username/e-mail (ver managers/user_search.py). No Postgres o
+# `icontains` do Django vira UPPER(col::text) LIKE UPPER('%termo%'), então
+# os índices são sobre a mesma expressão: GIN trigram para "contém" e
+# text_pattern_ops para prefixo. No SQLite a busca é só por prefixo, que o
+# LIKE resolve com um índice COLLATE NOCASE.
+POSTGRES_INDEXES = (
+    (
+        "accounts_usuario_username_trgm",
+        "USING gin (UPPER(username::text) gin_trgm_ops)",
+    ),
+    (
+        "accounts_usuario_email_trgm",
+        "USING gin (UPPER(email::text) gin_trgm_ops)",
+    ),
+    (
+        "accounts_usuario_username_upper_prefix",
+        "(UPPER(username::text) text_pattern_ops)",
+    ),
+    (
+        "accounts_usuario_email_upper_prefix",
+        "(UPPER(email::text) text_pattern_ops)",
+    ),
+)
+
+SQLITE_INDEXES = (
+    ("accounts_usuario_username_nocase", "(username COLLATE NOCASE)"),
+    ("accounts_usuario_email_nocase", "(email COLLATE NOCASE)"),
+)
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, definition in POSTGRES_INDEXES:
+            schema_editor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON accounts_usuario {definition}"
+            )
+    elif vendor == "sqlite":
+        for name, definition in SQLITE_INDEXES:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} "
+                f"ON accounts_usuario {definition}"
+            )
+
+
+def drop_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for name, _ in POSTGRES_INDEXES:
+            schema_editor.execute(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {name}"
+            )
+    elif vendor == "sqlite":
+        for name, _ in SQLITE_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0004_usuario_avatar_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_usuario_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
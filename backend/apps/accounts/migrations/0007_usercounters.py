@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:30
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def seed_counters(apps, schema_editor):
+    Usuario = apps.get_model('accounts', 'Usuario')
+    UserCounters = apps.get_model('accounts', 'UserCounters')
+    db = schema_editor.connection.alias
+    counts = Usuario.objects.using(db).aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        superusers=Count('id', filter=Q(is_superuser=True)),
+    )
+    UserCounters.objects.using(db).update_or_create(pk=1, defaults=counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_usuario_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.BigIntegerField(default=0)),
+                ('active', models.BigIntegerField(default=0)),
+                ('superusers', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,38 @@
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.db import models, router, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from apps.accounts.managers.token_versions import forget_token_version
+
+# Campos copiados para os claims do JWT (ou que devem invalidá-lo).
+TOKEN_CLAIM_FIELDS = (
+    "username", "email", "avatar", "avatar_hash", "is_superuser", "is_active",
+    "password",
+)
+
+# Campos que mudam os contadores de UserCounters.
+COUNTED_FIELDS = ("is_active", "is_superuser")
+
+
+class UsuarioQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        if not set(COUNTED_FIELDS).intersection(kwargs):
+            return super().update(**kwargs)
+        # update() não dispara sinais; user_counters importa este módulo
+        from apps.accounts.managers.user_counters import counted_update
+        return counted_update(self, kwargs)
+
+
+class UsuarioManager(UserManager.from_queryset(UsuarioQuerySet)):
+    @classmethod
+    def normalize_email(cls, email):
+        return (email or "").strip().lower()
+
+    def by_email(self, email):
+        # LOWER(email) = %s usa o índice único funcional declarado em Meta
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower=self.normalize_email(email)
+        )
 
 
 class Usuario(AbstractUser):
@@ -7,7 +40,97 @@ class Usuario(AbstractUser):
     avatar = models.ImageField(
         upload_to='avatars/', blank=True, null=True, default=''
     )
+    # sha256 da imagem original; identifica as miniaturas em avatars/variants
+    avatar_hash = models.CharField(max_length=64, blank=True, default='')
     is_active = models.BooleanField(default=True)
+    token_version = models.PositiveIntegerField(default=0)
+    # Last-Modified de /me e do detalhe (ver managers/user_cache.py)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UsuarioManager()
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"), name="accounts_usuario_email_lower_uniq"
+            ),
+        ]
 
     def __str__(self):
         return self.username
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._token_claims_state = instance._get_token_claims_state()
+        instance._counted_flags = instance._get_counted_flags()
+        return instance
+
+    def _get_counted_flags(self):
+        """Quanto este usuário soma em cada coluna de UserCounters."""
+        if self.get_deferred_fields().intersection(COUNTED_FIELDS):
+            return None
+        return {
+            "total": 1,
+            "active": int(bool(self.is_active)),
+            "superusers": int(bool(self.is_superuser)),
+        }
+
+    def _get_token_claims_state(self):
+        if self.get_deferred_fields().intersection(TOKEN_CLAIM_FIELDS):
+            return None
+        return {name: str(getattr(self, name)) for name in TOKEN_CLAIM_FIELDS}
+
+    def save(self, *args, **kwargs):
+        old_state = getattr(self, "_token_claims_state", None)
+        new_state = self._get_token_claims_state()
+        changed = False
+
+        if old_state is not None and new_state is not None:
+            update_fields = kwargs.get("update_fields")
+            fields = TOKEN_CLAIM_FIELDS
+            if update_fields is not None:
+                fields = set(fields).intersection(update_fields)
+            changed = any(old_state[f] != new_state[f] for f in fields)
+
+        if changed:
+            self.token_version += 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {
+                    *kwargs["update_fields"], "token_version"
+                }
+
+        # o post_save (contadores, ver signals.py) roda dentro da mesma
+        # transação do INSERT/UPDATE
+        using = kwargs.get("using") or router.db_for_write(
+            type(self), instance=self
+        )
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+        self._token_claims_state = new_state
+
+        if changed:
+            forget_token_version(self.pk)
+
+    def revoke_tokens(self):
+        """Invalida todos os tokens já emitidos para o usuário."""
+        Usuario.objects.filter(pk=self.pk).update(
+            token_version=F("token_version") + 1
+        )
+        self.refresh_from_db(fields=["token_version"])
+        forget_token_version(self.pk)
+
+
+class UserCounters(models.Model):
+    """
+    Contagens de usuários mantidas junto com as escritas (uma única linha),
+    para a listagem não precisar de COUNT(*) a cada página. Ver
+    managers/user_counters.py e o comando reconcile_user_counters.
+    """
+    total = models.BigIntegerField(default=0)
+    active = models.BigIntegerField(default=0)
+    superusers = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.total} usuários ({self.active} ativos)"
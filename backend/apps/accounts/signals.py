@@ -0,0 +1,51 @@
+from django.db.backends.signals import connection_created
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from core.db_router import pin_primary_on_commit
+from apps.accounts.managers.metrics import count_queries
+from apps.accounts.managers.revocation import revoked_tokens
+from apps.accounts.managers.token_versions import forget_token_version
+from apps.accounts.managers.user_counters import user_deleted, user_saved
+from apps.accounts.managers.user_search import ensure_sqlite_search_indexes
+from apps.accounts.models import Usuario
+
+
+@receiver(post_save, sender=Usuario)
+def usuario_saved(sender, instance, created, using, **kwargs):
+    # importado aqui: user_cache traz os serializers (DRF, Pillow), que o
+    # ready() não precisa carregar
+    from apps.accounts.managers.user_cache import forget_user_payload
+
+    forget_user_payload(instance.pk)
+    user_saved(instance, created, using=using)
+    pin_primary_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=Usuario)
+def usuario_deleted(sender, instance, using, **kwargs):
+    from apps.accounts.managers.user_cache import forget_user_payload
+
+    forget_token_version(instance.pk)
+    forget_user_payload(instance.pk)
+    user_deleted(instance, using=using)
+    pin_primary_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def token_blacklisted(sender, instance, created, **kwargs):
+    if created:
+        revoked_tokens.add(instance.token.jti, instance.token.expires_at)
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+@receiver(post_migrate)
+def restore_search_indexes(sender, using, **kwargs):
+    if sender.name == "apps.accounts":
+        ensure_sqlite_search_indexes(connections[using])
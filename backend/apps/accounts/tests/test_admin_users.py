@@ -4,7 +4,11 @@ from django.contrib.auth.base_user import AbstractBaseUser
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
+from django.core.cache import cache
+from django.db import connection
 from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.managers.user_search import search_users
+from apps.accounts.tokens import UserRefreshToken
 
 User = get_user_model()
 
@@ -54,6 +58,36 @@ class AdminUsersAPITest(TestCase):
         self.assertIn(self.user1.id, returned_ids)
         self.assertIn(self.user2.id, returned_ids)
 
+    def test_admin_list_users_cursor_pagination(self):
+        jwt_auth(self.client, self.admin)
+
+        response = self.client.get(
+            self.list_url, {"pagination": "cursor", "limit": 2}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(
+            [u["id"] for u in response.data["results"]],
+            [self.user2.id, self.user1.id],
+        )
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [u["id"] for u in response.data["results"]], [self.admin.id]
+        )
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_admin_list_users_invalid_pagination_mode(self):
+        jwt_auth(self.client, self.admin)
+
+        response = self.client.get(self.list_url, {"pagination": "page"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_admin_list_users_unauthenticated(self):
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -113,9 +147,91 @@ class AdminUsersAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class UserSearchTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse("admin-user-list")
+
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.maria = User.objects.create_user(
+            username="maria", email="maria@example.com", password="x"
+        )
+        self.mariana = User.objects.create_user(
+            username="mariana", email="mariana@example.com", password="x"
+        )
+        self.mari = User.objects.create_user(
+            username="mari", email="m.souza@example.com", password="x"
+        )
+        User.objects.create_user(
+            username="joao", email="joao@example.com", password="x"
+        )
+
+    def test_search_ranks_exact_then_prefix(self):
+        jwt_auth(self.client, self.admin)
+
+        response = self.client.get(self.list_url, {"q": "MARI"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        # exato primeiro; depois prefixo, do mais novo para o mais antigo
+        self.assertEqual(
+            [u["id"] for u in response.data["results"]],
+            [self.mari.id, self.mariana.id, self.maria.id],
+        )
+
+    def test_search_by_email_prefix(self):
+        jwt_auth(self.client, self.admin)
+
+        response = self.client.get(self.list_url, {"q": "m.souza"})
+        self.assertEqual(
+            [u["id"] for u in response.data["results"]], [self.mari.id]
+        )
+
+    def test_search_with_cursor_pagination(self):
+        jwt_auth(self.client, self.admin)
+
+        response = self.client.get(
+            self.list_url, {"q": "mari", "pagination": "cursor", "limit": 2}
+        )
+        ids = [u["id"] for u in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        ids += [u["id"] for u in response.data["results"]]
+
+        self.assertEqual(ids, [self.mari.id, self.mariana.id, self.maria.id])
+        self.assertIsNone(response.data["next"])
+
+    def test_search_uses_prefix_index_on_sqlite(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("plano específico do SQLite")
+
+        qs = search_users(User.objects.all(), "mari")
+        plan = qs.explain()
+
+        self.assertIn("accounts_usuario_username_nocase", plan)
+        self.assertIn("accounts_usuario_email_nocase", plan)
+
+    def test_admin_changelist_search(self):
+        self.client.force_login(self.admin)
+
+        response = self.client.get(
+            reverse("admin:accounts_usuario_changelist"), {"q": "mari"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [u.id for u in response.context["cl"].result_list],
+            [self.mari.id, self.mariana.id, self.maria.id],
+        )
+
+
 class MeAPITest(TestCase):
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
 
         self.user = User.objects.create_user(
             username="user1",
@@ -135,6 +251,46 @@ class MeAPITest(TestCase):
         self.assertEqual(response.data["email"], self.user.email)
         self.assertEqual(response.data["username"], self.user.username)
 
+    def test_me_with_claims_token_skips_database(self):
+        access = str(UserRefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        self.client.get(self.me_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.me_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.user.id)
+        self.assertEqual(response.data["email"], self.user.email)
+        self.assertEqual(response.data["username"], self.user.username)
+        self.assertIsNone(response.data["avatar"])
+
+    def test_me_claims_token_revoked(self):
+        access = str(UserRefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(
+            self.client.get(self.me_url).status_code, status.HTTP_200_OK
+        )
+
+        self.user.revoke_tokens()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_me_claims_token_invalidated_on_claim_change(self):
+        access = str(UserRefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(
+            self.client.get(self.me_url).status_code, status.HTTP_200_OK
+        )
+
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
     def test_me_unauthenticated(self):
         response = self.client.get(self.me_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
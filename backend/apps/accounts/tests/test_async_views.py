@@ -0,0 +1,172 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from rest_framework import status
+from apps.accounts.apis.async_views import AsyncGoogleAuthAPIView, AsyncLoginAPIView, AsyncMeAPIView, AsyncUserDetailAPIView, AsyncUserListAPIView # noqa E501
+from apps.accounts.managers.google_keys import google_certs
+from apps.accounts.tests.test_google_auth import CLIENT_ID, FakeGoogleIssuer
+from apps.accounts.tokens import UserRefreshToken
+from apps.accounts.managers.throttling import local_store
+
+User = get_user_model()
+
+
+def bearer(user):
+    access = UserRefreshToken.for_user(user).access_token
+    return {"Authorization": f"Bearer {access}"}
+
+
+class AsyncViewsTest(TestCase):
+    def setUp(self):
+        local_store.clear()
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.user1 = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+        self.admin_headers = bearer(self.admin)
+        self.user_headers = bearer(self.user1)
+
+    async def test_login_success(self):
+        request = self.factory.post(
+            "/api/v1/auth/login/",
+            {"email": "USER1@example.com", "password": "user12345"},
+            content_type="application/json",
+        )
+        response = await AsyncLoginAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["id"], self.user1.id)
+        self.assertIn("access", response.data["tokens"])
+        self.assertIn("refresh", response.data["tokens"])
+
+    async def test_login_invalid_credentials(self):
+        request = self.factory.post(
+            "/api/v1/auth/login/",
+            {"email": "user1@example.com", "password": "errada123"},
+            content_type="application/json",
+        )
+        response = await AsyncLoginAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"], "Credenciais inválidas.")
+
+    async def test_me(self):
+        request = self.factory.get("/api/v1/me/", headers=self.user_headers)
+        response = await AsyncMeAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "user1@example.com")
+
+    async def test_me_without_token(self):
+        request = self.factory.get("/api/v1/me/")
+        response = await AsyncMeAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response.headers)
+
+    async def test_me_revoked_token(self):
+        await sync_to_async(self.user1.revoke_tokens)()
+
+        request = self.factory.get("/api/v1/me/", headers=self.user_headers)
+        response = await AsyncMeAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_list_offset_pagination(self):
+        request = self.factory.get(
+            "/api/v1/admin/users/", {"limit": 1},
+            headers=self.admin_headers,
+        )
+        response = await AsyncUserListAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [u["id"] for u in response.data["results"]], [self.user1.id]
+        )
+        self.assertIsNotNone(response.data["next"])
+
+    async def test_list_cursor_pagination(self):
+        request = self.factory.get(
+            "/api/v1/admin/users/", {"pagination": "cursor"},
+            headers=self.admin_headers,
+        )
+        response = await AsyncUserListAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    async def test_list_requires_superuser(self):
+        request = self.factory.get(
+            "/api/v1/admin/users/", headers=self.user_headers
+        )
+        response = await AsyncUserListAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_detail_get_and_delete(self):
+        view = AsyncUserDetailAPIView.as_view()
+        url = f"/api/v1/admin/users/{self.user1.id}/"
+
+        response = await view(
+            self.factory.get(url, headers=self.admin_headers),
+            user_id=self.user1.id,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "user1")
+
+        response = await view(
+            self.factory.delete(url, headers=self.admin_headers),
+            user_id=self.user1.id,
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(await User.objects.filter(id=self.user1.id).aexists())
+
+        response = await view(
+            self.factory.get(url, headers=self.admin_headers),
+            user_id=self.user1.id,
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(GOOGLE_CLIENT_ID=CLIENT_ID)
+class AsyncGoogleAuthAPIViewTest(TestCase):
+    def setUp(self):
+        local_store.clear()
+        self.factory = AsyncRequestFactory()
+        self.issuer = FakeGoogleIssuer()
+        google_certs.set_fetcher(self.issuer)
+
+    def tearDown(self):
+        google_certs.set_fetcher(None)
+
+    async def test_google_login_success(self):
+        request = self.factory.post(
+            "/api/v1/auth/google/", {"token": self.issuer.token()},
+            content_type="application/json",
+        )
+        response = await AsyncGoogleAuthAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            await User.objects.filter(email="google.user@gmail.com").aexists()
+        )
+
+    async def test_google_login_missing_token(self):
+        request = self.factory.post(
+            "/api/v1/auth/google/", {}, content_type="application/json"
+        )
+        response = await AsyncGoogleAuthAPIView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,117 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+
+from apps.accounts.managers.avatar import process_avatar, variant_name
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(color="red", size=(400, 300)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return SimpleUploadedFile(
+        "avatar.png", buffer.getvalue(), content_type="image/png"
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AvatarPipelineTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_process_avatar_creates_square_variants(self):
+        digest = process_avatar(make_image())
+
+        for size in (64, 256):
+            with default_storage.open(variant_name(digest, size)) as f:
+                self.assertEqual(Image.open(f).size, (size, size))
+
+    def test_identical_images_are_stored_once(self):
+        first = process_avatar(make_image("blue"))
+        second = process_avatar(make_image("blue"))
+
+        self.assertEqual(first, second)
+        _, files = default_storage.listdir(
+            variant_name(first, 64).rsplit("/", 1)[0]
+        )
+        self.assertEqual(len(files), 2)
+
+    def test_invalid_image_has_no_variants(self):
+        upload = SimpleUploadedFile("avatar.jpg", b"image_content")
+        self.assertEqual(process_avatar(upload), "")
+
+    def test_decompression_bomb_is_invalid(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+            self.assertEqual(process_avatar(make_image("green")), "")
+
+    def test_concurrent_variant_write_keeps_canonical_name(self):
+        upload = make_image("purple")
+        real_save = default_storage.save
+
+        def racing_save(name, content):
+            # outro processo grava o mesmo arquivo antes deste
+            real_save(name, ContentFile(b"outro"))
+            return real_save(name, content)
+
+        with mock.patch.object(default_storage, "save", racing_save):
+            digest = process_avatar(upload)
+
+        directory = variant_name(digest, 64).rsplit("/", 1)[0]
+        _, files = default_storage.listdir(directory)
+        self.assertEqual(sorted(files), sorted(
+            variant_name(digest, size).rsplit("/", 1)[1]
+            for size in (64, 256)
+        ))
+
+    def test_register_exposes_variant_urls(self):
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@admin.com", password="admin123"
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.post(reverse("auth-register"), {
+            "username": "newuser",
+            "email": "newuser@example.com",
+            "password": "Django13$",
+            "password2": "Django13$",
+            "avatar": make_image("green"),
+        }, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        variants = response.data["user"]["avatar_variants"]
+        self.assertEqual(set(variants), {"64", "256"})
+        user = User.objects.get(username="newuser")
+        self.assertIn(user.avatar_hash, variants["64"])
+
+    def test_backfill_command(self):
+        user = User.objects.create_user(
+            username="user1", email="user1@example.com", password="x"
+        )
+        user.avatar = make_image("yellow")
+        user.save()
+
+        call_command("process_avatars", stdout=StringIO())
+
+        user.refresh_from_db()
+        self.assertTrue(user.avatar_hash)
+        self.assertTrue(
+            default_storage.exists(variant_name(user.avatar_hash, 256))
+        )
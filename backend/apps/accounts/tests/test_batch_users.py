@@ -0,0 +1,155 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from apps.accounts.managers.batch_users import BatchUserManager
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+class BatchUserAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("admin-user-batch")
+
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="user12345"
+            )
+            for i in range(3)
+        ]
+        access = UserRefreshToken.for_user(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def post(self, data):
+        return self.client.post(self.url, data, format="json")
+
+    def test_deactivate_revokes_tokens(self):
+        user = self.users[0]
+        refresh = UserRefreshToken.for_user(user)
+        access = refresh.access_token
+
+        response = self.post({
+            "action": "deactivate",
+            "ids": [user.id, self.admin.id, 999999],
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {"id": user.id, "status": "deactivated"},
+            {"id": self.admin.id, "status": "skipped"},
+            {"id": 999999, "status": "not_found"},
+        ])
+        self.assertEqual(
+            response.data["summary"],
+            {"deactivated": 1, "skipped": 1, "not_found": 1}
+        )
+
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
+        self.assertTrue(
+            BlacklistedToken.objects.filter(token__jti=refresh["jti"]).exists() # noqa E501
+        )
+
+        # o access token emitido antes da desativação deixa de valer
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = client.get(reverse("me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_activate_by_filter(self):
+        User.objects.filter(pk__in=[u.id for u in self.users[:2]]).update(
+            is_active=False
+        )
+
+        response = self.post({
+            "action": "activate",
+            "filter": {"username": "user"},
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["summary"], {"activated": 2, "unchanged": 1}
+        )
+        self.assertFalse(response.data["has_more"])
+        self.assertEqual(User.objects.filter(is_active=False).count(), 0)
+
+    def test_delete(self):
+        ids = [u.id for u in self.users[:2]]
+        response = self.post({"action": "delete", "ids": ids})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["summary"], {"deleted": 2})
+        self.assertFalse(User.objects.filter(pk__in=ids).exists())
+        self.assertTrue(User.objects.filter(pk=self.users[2].id).exists())
+
+    def test_requires_ids_or_filter(self):
+        response = self.post({"action": "delete"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post({
+            "action": "delete", "ids": [1], "filter": {"username": "u"},
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_filter(self):
+        response = self.post({
+            "action": "delete", "filter": {"joined_after": "ontem"},
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_superuser_forbidden(self):
+        access = UserRefreshToken.for_user(self.users[0]).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = self.post({"action": "delete", "ids": [self.admin.id]})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BatchUserManagerTest(TestCase):
+    def test_queries_do_not_grow_with_users(self):
+        ids = [
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="user12345"
+            ).id
+            for i in range(20)
+        ]
+        for user in User.objects.filter(pk__in=ids):
+            UserRefreshToken.for_user(user)
+
+        # SELECT, SELECT dos tokens, INSERT na blacklist, UPDATE dos
+        # usuários e dos contadores, mais savepoint/release da transação
+        with self.assertNumQueries(7):
+            results = BatchUserManager().run("deactivate", ids)
+
+        self.assertEqual({r["status"] for r in results}, {"deactivated"})
+
+    def test_chunks(self):
+        ids = [
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="user12345"
+            ).id
+            for i in range(5)
+        ]
+
+        results = BatchUserManager(chunk_size=2).run(
+            "deactivate", ids + ids[:1]
+        )
+
+        self.assertEqual([r["id"] for r in results], ids)
+        self.assertEqual(User.objects.filter(is_active=True).count(), 0)
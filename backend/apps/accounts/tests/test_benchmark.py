@@ -0,0 +1,56 @@
+from django.test import TestCase
+
+from apps.accounts.managers.benchmark import (
+    BenchmarkSuite, compare, percentile, summarize,
+)
+
+
+class BenchmarkHelpersTest(TestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize_and_compare(self):
+        samples = [
+            {"ms": float(ms), "status": 200, "ok": True, "queries": 2}
+            for ms in range(1, 11)
+        ]
+        samples.append({"ms": 50.0, "status": 500, "ok": False, "queries": 3})
+        summary = summarize(samples, elapsed=1.1)
+
+        self.assertEqual(summary["requests"], 11)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["error_statuses"], [500])
+        self.assertEqual(summary["latency_ms"]["max"], 50.0)
+        self.assertEqual(summary["queries"]["max"], 3)
+
+        current = {"endpoints": {"me": summary}}
+        self.assertEqual(compare(current, current)["me"]["p95_ms"], 0.0)
+
+
+class BenchmarkSuiteTest(TestCase):
+    def test_suite_runs_all_endpoints(self):
+        suite = BenchmarkSuite(users=5, requests=3, concurrency=1, warmup=0)
+        result = suite.run()
+
+        self.assertEqual(
+            set(result["endpoints"]),
+            {"login", "register", "refresh", "me", "user_list"},
+        )
+        for name, summary in result["endpoints"].items():
+            self.assertEqual(summary["errors"], 0, name)
+            self.assertEqual(summary["requests"], 3)
+            self.assertIsNotNone(summary["queries"]["mean"])
+
+    def test_suite_concurrency_levels(self):
+        suite = BenchmarkSuite(
+            users=3, requests=2, endpoints=("me",), warmup=0
+        )
+        result = suite.run(concurrency_levels=[1, 2])
+
+        self.assertEqual(result["meta"]["concurrency"], [1, 2])
+        self.assertEqual(set(result["scaling"]), {"1", "2"})
+        self.assertEqual(result["endpoints"], result["scaling"]["1"])
@@ -0,0 +1,162 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class UserBulkImportAPIViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("admin-user-import")
+
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def upload(self, name, content):
+        return self.client.post(
+            self.url,
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart"
+        )
+
+    def test_import_csv_with_row_errors(self):
+        content = (
+            "username,email,password\n"
+            "ana,ana@example.com,Django13$\n"
+            "bia,ADMIN@admin.com,Django13$\n"
+            "caio,caio@example.com,123\n"
+            "ana,outra@example.com,Django13$\n"
+            "duda,duda@example.com,Django13$\n"
+        )
+
+        response = self.upload("users.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 5)
+        self.assertEqual(response.data["created"], 2)
+        errors = {e["row"]: e["errors"] for e in response.data["errors"]}
+        self.assertEqual(set(errors), {3, 4, 5})
+        self.assertIn("email", errors[3])
+        self.assertIn("password", errors[4])
+        self.assertIn("username", errors[5])
+
+        user = User.objects.get(username="duda")
+        self.assertTrue(user.check_password("Django13$"))
+
+    def test_import_jsonl(self):
+        lines = [
+            json.dumps({
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password": "Django13$",
+            })
+            for i in range(3)
+        ]
+        lines.append("{nao e json")
+
+        response = self.upload("users.jsonl", "\n".join(lines))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(response.data["errors"][0]["row"], 4)
+        self.assertEqual(User.objects.count(), 4)
+
+    def test_import_invalid_encoding(self):
+        content = (
+            "username,email,password\n"
+            "ana,ana@example.com,Django13$\n"
+        ).encode() + b"bia,bia@example.com,Dj\xe3ngo13$\n"
+
+        response = self.client.post(
+            self.url, {"file": SimpleUploadedFile("users.csv", content)},
+            format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(
+            response.data["errors"][0]["errors"]["row"],
+            ["Arquivo não está em UTF-8."]
+        )
+
+    def test_import_malformed_csv(self):
+        content = (
+            "username,email,password\n"
+            "ana,ana@example.com,Django13$\n"
+            '"bia"x,bia@example.com,Django13$\n'
+        )
+
+        response = self.upload("users.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 3)
+        self.assertIn("CSV inválido", response.data["errors"][0]["errors"]["row"][0]) # noqa E501
+
+    def test_import_normalizes_username(self):
+        content = (
+            "username,email,password\n"
+            "\ufb01lipe,filipe@example.com,Django13$\n"
+        )
+
+        response = self.upload("users.csv", content)
+
+        self.assertEqual(response.data["created"], 1)
+        self.assertTrue(User.objects.filter(username="filipe").exists())
+
+    @override_settings(BULK_IMPORT_MAX_ROWS=2)
+    def test_import_row_limit(self):
+        content = "username,email,password\n" + "".join(
+            f"user{i},user{i}@example.com,Django13$\n" for i in range(3)
+        )
+
+        response = self.upload("users.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", response.data["errors"])
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_import_without_file(self):
+        response = self.client.post(self.url, {}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_forbidden_for_normal_user(self):
+        user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.upload("users.csv", "username,email,password\n")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ImportUsersCommandTest(TestCase):
+    def test_import_users_command(self):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", delete=False
+        ) as f:
+            f.write("username,email,password\n")
+            f.write("ana,ana@example.com,Django13$\n")
+        self.addCleanup(os.remove, f.name)
+
+        out = StringIO()
+        call_command("import_users", f.name, stdout=out)
+
+        self.assertTrue(User.objects.filter(username="ana").exists())
+        self.assertIn("1 de 1", out.getvalue())
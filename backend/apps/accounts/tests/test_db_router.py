@@ -0,0 +1,137 @@
+import os
+import random
+import subprocess
+import sys
+from importlib.util import find_spec
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings # noqa E501
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.accounts.tokens import UserRefreshToken
+from core.db_router import ReplicaRouter, pin_primary, replica_reads
+
+User = get_user_model()
+
+
+def bearer(client, user):
+    access = UserRefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+
+class ReadView:
+    @replica_reads
+    def get(self, request, *args, **kwargs):
+        return ReplicaRouter().db_for_read(User)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/")
+        self.request.user = mock.Mock(pk=1)
+
+    def test_reads_go_to_replica_only_when_marked(self):
+        router = ReplicaRouter()
+
+        self.assertEqual(router.db_for_read(User), "default")
+        self.assertEqual(ReadView().get(self.request), "replica")
+        self.assertEqual(router.db_for_write(User), "default")
+        self.assertFalse(router.allow_migrate("replica", "accounts"))
+
+    def test_pinned_user_reads_primary(self):
+        pin_primary(1)
+        self.assertEqual(ReadView().get(self.request), "default")
+
+    def test_pinned_subject_reads_primary(self):
+        pin_primary(7)
+        self.assertEqual(ReadView().get(self.request, user_id=7), "default")
+        self.assertEqual(ReadView().get(self.request, user_id=8), "replica")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replica_router_is_neutral(self):
+        self.assertIsNone(ReplicaRouter().db_for_read(User))
+        self.assertEqual(ReadView().get(self.request), None)
+
+
+# a "réplica" é o próprio banco de teste: as consultas funcionam e o teste
+# só observa quando o roteador escolheu uma réplica
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReadYourWritesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+        cache.clear()
+        bearer(self.client, self.admin)
+
+    def replica_used(self, url):
+        with mock.patch(
+            "core.db_router.random.choice", wraps=random.choice
+        ) as choice:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return choice.called
+
+    def test_list_reads_replica(self):
+        self.assertTrue(self.replica_used(reverse("admin-user-list")))
+
+    def test_writer_reads_primary_after_write(self):
+        response = self.client.post(
+            reverse("admin-user-batch"),
+            {"action": "deactivate", "ids": [self.user.pk]},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertFalse(self.replica_used(reverse("admin-user-list")))
+
+    def test_changed_user_reads_primary(self):
+        url = reverse("admin-user-detail", kwargs={"user_id": self.user.pk})
+        self.assertTrue(self.replica_used(url))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Novo"
+            self.user.save()
+
+        self.assertFalse(self.replica_used(url))
+
+
+class DatabaseSettingsTest(SimpleTestCase):
+    def load_settings(self, **env):
+        result = subprocess.run(
+            [sys.executable, "-c", "import core.settings"],
+            cwd=settings.BASE_DIR, env={**os.environ, **env},
+            capture_output=True, text=True,
+        )
+        return result.returncode, result.stderr
+
+    def test_replica_requires_shared_cache(self):
+        code, stderr = self.load_settings(DB_REPLICA_HOST="db-replica")
+        self.assertNotEqual(code, 0)
+        self.assertIn("DB_REPLICA_HOST exige REDIS_URL", stderr)
+
+        code, stderr = self.load_settings(
+            DB_REPLICA_HOST="db-replica", REDIS_URL="redis://redis:6379/0"
+        )
+        self.assertEqual(code, 0, stderr)
+
+    def test_pool_requires_psycopg3(self):
+        if find_spec("psycopg") and find_spec("psycopg_pool"):
+            self.skipTest("psycopg 3 com pool instalado")
+        code, stderr = self.load_settings(DB_POOL="True")
+        self.assertNotEqual(code, 0)
+        self.assertIn("DB_POOL=True exige psycopg 3", stderr)
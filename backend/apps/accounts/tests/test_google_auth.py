@@ -0,0 +1,234 @@
+import datetime
+import json
+import time
+from unittest import mock
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from google.auth import crypt, jwt
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.managers.google_keys import GoogleCertsCache, google_certs
+from apps.accounts.managers.google_users import allocate_username, get_or_create_google_user # noqa E501
+from apps.accounts.managers.throttling import local_store
+
+User = get_user_model()
+
+CLIENT_ID = "test-client-id.apps.googleusercontent.com"
+
+
+class FakeResponse:
+    def __init__(self, status, data, headers=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+
+class FakeGoogleIssuer:
+    """Emissor local: assina ID tokens e serve os certificados."""
+
+    def __init__(self, kid="kid-1", max_age=3600):
+        self.kid = kid
+        self.max_age = max_age
+        self.calls = 0
+        self.fail = False
+        self._key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "fake")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self._key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(self._key, hashes.SHA256())
+        )
+        self.cert_pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+
+    def __call__(self, url, method="GET", **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("offline")
+        return FakeResponse(
+            200,
+            json.dumps({self.kid: self.cert_pem}).encode(),
+            {"Cache-Control": f"public, max-age={self.max_age}"},
+        )
+
+    def token(self, email="google.user@gmail.com"):
+        pem = self._key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        signer = crypt.RSASigner.from_string(pem, key_id=self.kid)
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "iat": now,
+            "exp": now + 300,
+            "email": email,
+        }
+        return jwt.encode(signer, payload).decode()
+
+
+class GoogleCertsCacheTest(TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.issuer = FakeGoogleIssuer(max_age=60)
+        self.cache = GoogleCertsCache(self.issuer, clock=lambda: self.now)
+        self.url = "https://example.com/certs"
+
+    def test_respects_max_age(self):
+        self.cache(self.url)
+        self.cache(self.url)
+        self.assertEqual(self.issuer.calls, 1)
+
+        self.now += 61
+        self.cache(self.url)
+        self.assertEqual(self.issuer.calls, 2)
+
+    def test_serves_stale_keys_when_fetch_fails(self):
+        first = self.cache(self.url)
+
+        self.now += 61
+        self.issuer.fail = True
+        self.assertIs(self.cache(self.url), first)
+
+        # não tenta de novo a cada chamada enquanto está em backoff
+        self.cache(self.url)
+        self.assertEqual(self.issuer.calls, 2)
+
+    def test_fetch_failure_without_cache_raises(self):
+        self.issuer.fail = True
+        with self.assertRaises(ConnectionError):
+            self.cache(self.url)
+
+
+@override_settings(GOOGLE_CLIENT_ID=CLIENT_ID)
+class GoogleAuthAPIViewTest(TestCase):
+    def setUp(self):
+        local_store.clear()
+        self.client = APIClient()
+        self.url = reverse("auth-google")
+        self.issuer = FakeGoogleIssuer()
+        google_certs.set_fetcher(self.issuer)
+
+    def tearDown(self):
+        google_certs.set_fetcher(None)
+
+    def test_google_login_success_uses_cached_keys(self):
+        for _ in range(2):
+            response = self.client.post(
+                self.url, {"token": self.issuer.token()}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.issuer.calls, 1)
+        self.assertTrue(
+            User.objects.filter(email="google.user@gmail.com").exists()
+        )
+
+    def test_google_login_invalid_token(self):
+        other = FakeGoogleIssuer()
+        response = self.client.post(
+            self.url, {"token": other.token()}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_google_login_missing_token(self):
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_google_login_same_local_part(self):
+        User.objects.create_user(
+            username="google.user", email="google.user@empresa.com",
+            password="user12345"
+        )
+
+        response = self.client.post(
+            self.url, {"token": self.issuer.token()}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["username"], "google.user2")
+
+
+class GoogleUserProvisioningTest(TestCase):
+    def test_allocates_lowest_free_suffix(self):
+        for username in ("maria", "maria2", "maria4", "mariana"):
+            User.objects.create_user(
+                username=username, email=f"{username}@example.com"
+            )
+
+        self.assertEqual(allocate_username("maria"), "maria3")
+        self.assertEqual(allocate_username("jose"), "jose")
+
+    def test_max_length_local_part(self):
+        local = "x" * 150
+        User.objects.create_user(username=local, email="a@example.com")
+        # o candidato truncado "xxx...x2" já existe e não começa com `local`
+        User.objects.create_user(
+            username="x" * 149 + "2", email="b@example.com"
+        )
+
+        user, created = get_or_create_google_user(f"{local}@gmail.com")
+
+        self.assertTrue(created)
+        self.assertEqual(user.username, "x" * 144 + "2")
+
+    def test_allocation_is_one_query(self):
+        with self.assertNumQueries(1):
+            allocate_username("maria")
+
+    def test_existing_email_any_case(self):
+        user = User.objects.create_user(
+            username="maria", email="maria@example.com"
+        )
+
+        found, created = get_or_create_google_user("Maria@Example.com")
+
+        self.assertEqual(found, user)
+        self.assertFalse(created)
+
+    def test_lost_username_race_retries(self):
+        User.objects.create_user(username="maria", email="maria@empresa.com")
+
+        with mock.patch(
+            "apps.accounts.managers.google_users.allocate_username",
+            side_effect=["maria", "maria2"],
+        ):
+            user, created = get_or_create_google_user("maria@gmail.com")
+
+        self.assertTrue(created)
+        self.assertEqual(user.username, "maria2")
+
+    def test_lost_email_race_returns_winner(self):
+        winner = User.objects.create_user(
+            username="maria", email="maria@gmail.com"
+        )
+        missing = User.objects.none()
+
+        with mock.patch.object(
+            type(User.objects), "by_email",
+            side_effect=[missing, User.objects.filter(pk=winner.pk)],
+        ), mock.patch(
+            "apps.accounts.managers.google_users.allocate_username",
+            return_value="maria2",
+        ):
+            user, created = get_or_create_google_user("maria@gmail.com")
+
+        self.assertFalse(created)
+        self.assertEqual(user, winner)
+        self.assertEqual(User.objects.count(), 1)
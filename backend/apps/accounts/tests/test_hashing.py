@@ -0,0 +1,117 @@
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+
+from apps.accounts.managers.hashing import PasswordHashingPool
+
+User = get_user_model()
+
+
+class PasswordHashingPoolTest(TestCase):
+    def test_process_pool_hash_and_verify(self):
+        pool = PasswordHashingPool(workers=1, max_pending=2)
+        self.addCleanup(pool.shutdown)
+
+        encoded = pool.make_password("Django13$")
+
+        self.assertTrue(check_password("Django13$", encoded))
+        self.assertTrue(pool.check_password("Django13$", encoded))
+        self.assertFalse(pool.check_password("errada", encoded))
+
+        metrics = pool.metrics()
+        self.assertEqual(metrics["hash_total"], 1)
+        self.assertEqual(metrics["verify_total"], 2)
+        self.assertEqual(metrics["in_flight"], 0)
+
+    def test_rejects_when_saturated(self):
+        pool = PasswordHashingPool(
+            workers=0, max_pending=1, acquire_timeout=0
+        )
+        pool._get_executor()
+        pool._slots.acquire()
+
+        with self.assertRaises(Exception) as ctx:
+            pool.make_password("Django13$")
+
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(pool.metrics()["rejected_total"], 1)
+
+    def test_async_without_workers_runs_off_event_loop(self):
+        pool = PasswordHashingPool(workers=0, max_pending=2)
+        threads = []
+
+        def fake_hash(raw_password):
+            threads.append(threading.get_ident())
+            return "hash"
+
+        with mock.patch(
+            "apps.accounts.managers.hashing._make_password", fake_hash
+        ):
+            async def run():
+                return threading.get_ident(), await pool.amake_password("x")
+
+            loop_thread, result = async_to_sync(run)()
+
+        self.assertEqual(result, "hash")
+        self.assertNotEqual(threads, [loop_thread])
+
+
+class HashingPoolViewsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+
+    def test_register_inserts_user_once_with_final_hash(self):
+        self.client.force_authenticate(user=self.admin)
+        data = {
+            "username": "newuser",
+            "email": "newuser@example.com",
+            "password": "Django13$",
+            "password2": "Django13$",
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse("auth-register"), data, format="multipart"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        writes = [
+            q["sql"] for q in ctx.captured_queries
+            if '"accounts_usuario"' in q["sql"]
+            and q["sql"].startswith(("INSERT", "UPDATE"))
+        ]
+        self.assertEqual(len(writes), 1)
+        user = User.objects.get(username="newuser")
+        self.assertTrue(user.check_password("Django13$"))
+
+    def test_login_returns_503_when_pool_is_busy(self):
+        busy = PasswordHashingPool(workers=0, max_pending=1, acquire_timeout=0)
+        busy._get_executor()
+        busy._slots.acquire()
+
+        with mock.patch("apps.accounts.backends.hashing_pool", busy):
+            response = self.client.post(
+                reverse("auth-login"),
+                {"email": "admin@admin.com", "password": "admin123"},
+                format="json"
+            )
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response["Retry-After"], "1")
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from apps.accounts.apis.renderers import FastJSONRenderer
+from apps.accounts.apis.serializers import UserSerializer
+from apps.accounts.managers.lean_users import lean_rows, serialize_users
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+class LeanUsersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        users = [
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="user12345"
+            )
+            for i in range(3)
+        ]
+        User.objects.filter(pk=users[0].pk).update(
+            avatar="avatars/foto de perfil ção.png", avatar_hash="ab" * 32
+        )
+        User.objects.filter(pk=users[1].pk).update(
+            avatar="avatars/a?b#c:d.png"
+        )
+        User.objects.filter(pk=users[2].pk).update(avatar=None)
+
+    def expected(self, request=None):
+        return UserSerializer(
+            User.objects.order_by("id"), many=True,
+            context={"request": request}
+        ).data
+
+    def test_matches_user_serializer(self):
+        rows = lean_rows(User.objects.order_by("id"))
+        self.assertEqual(serialize_users(rows), self.expected())
+
+    def test_matches_with_request(self):
+        request = RequestFactory().get("/")
+        rows = lean_rows(User.objects.order_by("id"))
+        self.assertEqual(
+            serialize_users(rows, request), self.expected(request)
+        )
+
+    def test_list_response_bytes(self):
+        client = APIClient()
+        access = UserRefreshToken.for_user(self.admin).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = client.get(reverse("admin-user-list"), {"limit": 100})
+
+        expected = UserSerializer(
+            User.objects.order_by("-id"), many=True
+        ).data
+        body = JSONRenderer().render({
+            "count": 4, "next": None, "previous": None, "results": expected,
+        })
+        self.assertEqual(response.content, body)
+
+    def test_renderer_matches_drf(self):
+        data = {
+            "texto": "ção     \"aspas\" \\ \n\t\x01 😀",
+            "lista": [1, -2, None, True, False, {"a": []}],
+        }
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
@@ -3,12 +3,16 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.accounts.managers.throttling import local_store
 
 User = get_user_model()
 
 
 class LoginAPIViewTest(TestCase):
     def setUp(self):
+        local_store.clear()
         self.client = APIClient()
         self.url = reverse("auth-login")
 
@@ -55,3 +59,24 @@ class LoginAPIViewTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("errors", response.data)
+
+    def test_login_email_case_insensitive(self):
+        data = {"email": "User1@Example.COM", "password": "user12345"}
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["id"], self.user.id)
+
+    def test_login_loads_user_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.url, self.valid_data, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user_selects = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT")
+            and '"accounts_usuario"' in q["sql"]
+        ]
+        self.assertEqual(len(user_selects), 1)
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.accounts.managers.metrics import Histogram, request_metrics
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+EXTERNAL_IP = "203.0.113.10"
+
+
+class HistogramTest(TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((1, 5))
+        for value in (0, 1, 3, 10):
+            histogram.observe(value)
+
+        self.assertEqual(
+            list(histogram.cumulative()), [(1, 2), (5, 3), ("+Inf", 4)]
+        )
+        self.assertEqual(histogram.sum, 14)
+
+
+class MetricsAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        request_metrics.reset()
+        self.client = APIClient()
+        self.url = reverse("metrics")
+
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+
+    def auth(self, user):
+        access = UserRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_records_requests_by_url_name(self):
+        self.auth(self.admin)
+        self.client.get(reverse("admin-user-list"))
+        self.client.get(reverse("me"))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn(
+            'http_requests_total{view="admin-user-list",method="GET",'
+            'status="200"} 1', body
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{view="me",method="GET"} 1',
+            body
+        )
+        # /me com claims no token não consulta o banco; a lista sim
+        self.assertIn(
+            'http_request_db_queries_sum{view="me",method="GET"} 0.000000',
+            body
+        )
+        self.assertNotIn(
+            'http_request_db_queries_sum{view="admin-user-list",'
+            'method="GET"} 0.000000', body
+        )
+        self.assertIn("password_hashing_in_flight", body)
+
+    def test_external_anonymous_denied(self):
+        response = self.client.get(self.url, REMOTE_ADDR=EXTERNAL_IP)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_external_non_superuser_denied(self):
+        self.auth(self.user)
+        response = self.client.get(self.url, REMOTE_ADDR=EXTERNAL_IP)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_external_superuser_allowed(self):
+        self.auth(self.admin)
+        response = self.client.get(self.url, REMOTE_ADDR=EXTERNAL_IP)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_localhost_allowed_without_token(self):
+        response = self.client.get(self.url, REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_private_ip_denied_by_default(self):
+        # atrás de um proxy todo cliente externo chega com IP privado
+        response = self.client.get(self.url, REMOTE_ADDR="10.1.2.3")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"])
+    def test_configured_network_allowed_without_token(self):
+        response = self.client.get(self.url, REMOTE_ADDR="10.1.2.3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
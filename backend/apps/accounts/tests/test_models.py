@@ -34,3 +34,16 @@ class UsuarioModelTest(TestCase):
                 email='testuser@example.com',
                 password='securepassword2',
             )
+
+    def test_usuario_email_unico_case_insensitive(self):
+        with self.assertRaises(Exception):
+            Usuario.objects.create(
+                username='testuser3',
+                email='TestUser@Example.com',
+            )
+
+    def test_usuario_by_email(self):
+        self.assertEqual(
+            Usuario.objects.by_email(' TESTUSER@example.com ').get(),
+            self.user
+        )
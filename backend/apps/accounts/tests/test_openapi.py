@@ -0,0 +1,78 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from drf_yasg.codecs import OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework.test import APIClient
+from core.openapi import api_info, schema_cache
+
+SCHEMA_DIR = tempfile.mkdtemp()
+
+
+@override_settings(OPENAPI_SCHEMA_DIR=SCHEMA_DIR, CODE_VERSION="test-1")
+class OpenAPISchemaTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(SCHEMA_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(SCHEMA_DIR, ignore_errors=True)
+        schema_cache.clear()
+        self.addCleanup(schema_cache.clear)
+        self.client = APIClient()
+
+    def test_json_generated_once_with_etag(self):
+        with mock.patch.object(
+            OpenAPISchemaGenerator, "get_schema",
+            wraps=OpenAPISchemaGenerator(api_info()).get_schema,
+        ) as get_schema:
+            response = self.client.get("/swagger.json/")
+            self.client.get("/swagger.json/")
+            self.client.get("/swagger/", {"format": "openapi"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_schema.call_count, 1)
+        schema = json.loads(response.content)
+        self.assertIn("/api/v1/me/", schema["paths"])
+        self.assertNotIn("host", schema)
+
+        etag = response["ETag"]
+        response = self.client.get("/swagger.json/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_yaml_matches_drf_yasg(self):
+        response = self.client.get("/swagger.yaml/")
+
+        self.assertEqual(response.status_code, 200)
+        expected = OpenAPICodecYaml([]).encode(
+            OpenAPISchemaGenerator(api_info()).get_schema(None, public=True)
+        )
+        self.assertEqual(response.content, expected)
+
+    def test_ui_still_served(self):
+        response = self.client.get("/swagger/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"swagger", response.content.lower())
+
+    def test_command_writes_file_per_version(self):
+        call_command("build_openapi_schema", stdout=StringIO())
+        first = schema_cache.path()
+        self.assertTrue(first.exists())
+
+        # outro processo com a mesma versão só lê o arquivo
+        schema_cache.clear()
+        with mock.patch.object(OpenAPISchemaGenerator, "get_schema") as gen:
+            response = self.client.get("/swagger.json/")
+        gen.assert_not_called()
+        self.assertEqual(response.content, first.read_bytes())
+
+        with self.settings(CODE_VERSION="test-2"):
+            call_command("build_openapi_schema", stdout=StringIO())
+            self.assertNotEqual(schema_cache.path(), first)
+            self.assertTrue(schema_cache.path().exists())
@@ -0,0 +1,149 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken, OutstandingToken,
+)
+from apps.accounts.managers.outstanding_tokens import (
+    OutstandingTokenBuffer, outstanding_tokens,
+)
+from apps.accounts.managers.revocation import (
+    blacklist_user_tokens, revoked_tokens,
+)
+from apps.accounts.managers.throttling import local_store
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+@override_settings(OUTSTANDING_TOKEN_BUFFER=True)
+class OutstandingTokenBufferTest(TestCase):
+    def setUp(self):
+        local_store.clear()
+        revoked_tokens.reset()
+        # a gravação é feita pelos testes, não pela thread
+        patcher = mock.patch.object(outstanding_tokens, "_start")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        outstanding_tokens._pending.clear()
+        self.addCleanup(outstanding_tokens._pending.clear)
+
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+
+    def test_login_queues_instead_of_insert(self):
+        response = self.client.post(
+            reverse("auth-login"),
+            {"email": "user1@example.com", "password": "user12345"},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(OutstandingToken.objects.exists())
+        self.assertEqual(len(outstanding_tokens), 1)
+
+        self.assertEqual(outstanding_tokens.flush(), 1)
+        token = OutstandingToken.objects.get()
+        self.assertEqual(token.user_id, self.user.pk)
+        self.assertEqual(token.token, response.data["tokens"]["refresh"])
+
+    def test_logout_before_flush(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}"
+        )
+
+        response = self.client.post(
+            reverse("auth-logout"), {"refresh": str(refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # o flush ignora o registro já criado pelo blacklist()
+        self.assertEqual(outstanding_tokens.flush(), 1)
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+        response = self.client.post(
+            reverse("token_refresh"), {"refresh": str(refresh)},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_bulk_revoke_flushes_queue(self):
+        UserRefreshToken.for_user(self.user)
+
+        self.assertEqual(blacklist_user_tokens([self.user.pk]), 1)
+        self.assertEqual(len(outstanding_tokens), 0)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_queued_elsewhere_refused_by_version(self):
+        # token na fila de outro processo: sem registro para a blacklist
+        refresh = UserRefreshToken.for_user(self.user)
+        outstanding_tokens._pending.clear()
+
+        self.user.revoke_tokens()
+        response = self.client.post(
+            reverse("token_refresh"), {"refresh": str(refresh)},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_batch_survives_flush_failure(self):
+        admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        refresh = UserRefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {UserRefreshToken.for_user(admin).access_token}" # noqa E501
+        )
+
+        with mock.patch.object(
+            outstanding_tokens, "_write", side_effect=DatabaseError
+        ):
+            response = self.client.post(
+                reverse("admin-user-batch"),
+                {"action": "deactivate", "ids": [self.user.pk]},
+                format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(outstanding_tokens), 2)
+        self.client.credentials()
+        response = self.client.post(
+            reverse("token_refresh"), {"refresh": str(refresh)},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_deleted_user_keeps_token_without_user(self):
+        UserRefreshToken.for_user(self.user)
+        self.user.delete()
+
+        outstanding_tokens.flush()
+
+        self.assertIsNone(OutstandingToken.objects.get().user_id)
+
+    def test_full_queue_wakes_flush_thread(self):
+        buffer = OutstandingTokenBuffer(flush_interval=3600, max_size=2)
+        with mock.patch.object(buffer, "_start"):
+            buffer.add(OutstandingToken(jti="a"))
+            self.assertFalse(buffer._wakeup.is_set())
+            buffer.add(OutstandingToken(jti="b"))
+        self.assertTrue(buffer._wakeup.is_set())
+
+    @override_settings(OUTSTANDING_TOKEN_BUFFER=False)
+    def test_disabled_inserts_on_issue(self):
+        UserRefreshToken.for_user(self.user)
+
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(len(outstanding_tokens), 0)
@@ -1,4 +1,9 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from unittest import skipIf
+
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -90,3 +95,115 @@ class RegisterAPIViewTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("errors", response.data)
         self.assertIn("email", response.data["errors"])
+
+    def test_register_existing_email_other_case(self):
+        self.existing_user_data["username"] = "outro"
+        self.existing_user_data["email"] = "ExistingUser@Example.com"
+
+        response = self.client.post(
+            self.url, self.existing_user_data, format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"]["email"],
+            ["Este email já está registrado."]
+        )
+
+    def test_register_existing_username(self):
+        self.existing_user_data["email"] = "outro@example.com"
+
+        response = self.client.post(
+            self.url, self.existing_user_data, format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"]["username"],
+            ["Este username já está registrado."]
+        )
+
+    def test_register_blank_username(self):
+        self.valid_data["username"] = "   "
+
+        response = self.client.post(
+            self.url, self.valid_data, format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("username", response.data["errors"])
+        self.assertFalse(User.objects.filter(username="").exists())
+
+    def test_register_normalizes_username(self):
+        self.valid_data["username"] = "\ufb01lipe"
+
+        response = self.client.post(
+            self.url, self.valid_data, format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["user"]["username"], "filipe")
+
+    def test_register_invalid_email(self):
+        self.valid_data["email"] = "nao-e-email"
+
+        response = self.client.post(
+            self.url, self.valid_data, format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data["errors"])
+
+    def test_register_no_lookup_before_insert(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.url, self.existing_user_data, format='multipart'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        user_queries = [
+            q["sql"] for q in ctx.captured_queries
+            if "accounts_usuario" in q["sql"]
+        ]
+        self.assertEqual(len(user_queries), 1)
+        self.assertTrue(user_queries[0].startswith("INSERT"))
+
+
+@skipIf(connection.vendor == "sqlite", "SQLite serializa as escritas")
+class RegisterConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+
+    def register(self, i):
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        try:
+            return client.post(
+                reverse('auth-register'),
+                {
+                    # metade repete o username, todos repetem o email
+                    "username": f"corrida{i % 2}",
+                    "email": "Corrida@Example.com" if i % 3 else
+                             "corrida@example.com",
+                    "password": "Django13$",
+                    "password2": "Django13$",
+                },
+                format='multipart'
+            ).status_code
+        finally:
+            connections.close_all()
+
+    def test_concurrent_duplicates_never_500(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            codes = list(executor.map(self.register, range(32)))
+
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), 1)
+        self.assertEqual(codes.count(status.HTTP_400_BAD_REQUEST), 31)
+        self.assertEqual(
+            User.objects.filter(email__iexact="corrida@example.com").count(),
+            1
+        )
@@ -0,0 +1,28 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from apps.accounts.management.commands.startup_report import parse_importtime # noqa E501
+
+
+class StartupReportTest(SimpleTestCase):
+    def test_parse_importtime(self):
+        rows = parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   pkg.sub\n"
+            "import time:        50 |        150 | pkg\n"
+        )
+        self.assertEqual(rows, [("pkg.sub", 100, 100, 1), ("pkg", 50, 150, 0)]) # noqa E501
+
+    def test_heavy_packages_not_imported_at_boot(self):
+        out = StringIO()
+        call_command("startup_report", "--limit", "5", stdout=out)
+
+        self.assertIn("Total:", out.getvalue())
+        self.assertNotIn("deveriam ser lazy", out.getvalue())
+
+    def test_budget(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "startup_report", "--budget-ms", "0.001", stdout=StringIO()
+            )
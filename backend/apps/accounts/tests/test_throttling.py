@@ -0,0 +1,193 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.accounts.apis.async_views import AsyncLoginAPIView
+from apps.accounts.managers.throttling import (
+    CacheWindowStore, LocalWindowStore, local_store,
+)
+
+User = get_user_model()
+
+RATES = {
+    "login_ip": "5/min",
+    "login_email": "2/min",
+    "google_ip": "1/min",
+}
+
+
+class LocalWindowStoreTest(TestCase):
+    def test_sliding_window(self):
+        now = [100.0]
+        store = LocalWindowStore(clock=lambda: now[0])
+
+        self.assertIsNone(store.hit("k", 2, 60))
+        now[0] += 30
+        self.assertIsNone(store.hit("k", 2, 60))
+        now[0] += 10
+        # a primeira tentativa sai da janela em 20s
+        self.assertAlmostEqual(store.hit("k", 2, 60), 20.0)
+
+        now[0] += 20
+        self.assertIsNone(store.hit("k", 2, 60))
+
+    def test_sweep_expired_keys(self):
+        now = [0.0]
+        store = LocalWindowStore(max_keys=2, clock=lambda: now[0])
+        store.hit("a", 1, 10)
+        store.hit("b", 1, 10)
+        now[0] += 11
+        store.hit("c", 1, 10)
+
+        self.assertEqual(set(store._entries), {"c"})
+
+
+class CacheWindowStoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_sliding_window(self):
+        now = [100.0]
+        store = CacheWindowStore(clock=lambda: now[0])
+
+        self.assertIsNone(store.hit("k", 2, 60))
+        now[0] += 30
+        self.assertIsNone(store.hit("k", 2, 60))
+        now[0] += 10
+        # a primeira tentativa sai da janela no fim da sua sub-janela
+        self.assertAlmostEqual(store.hit("k", 2, 60), 22.0)
+
+        now[0] += 22
+        self.assertIsNone(store.hit("k", 2, 60))
+
+    def test_concurrent_hits_respect_limit(self):
+        # leituras lentas abrem a janela entre ler e gravar a contagem
+        class SlowCache:
+            def __getattr__(self, name):
+                return getattr(cache, name)
+
+            def get(self, *args, **kwargs):
+                value = cache.get(*args, **kwargs)
+                time.sleep(0.01)
+                return value
+
+            def get_many(self, *args, **kwargs):
+                value = cache.get_many(*args, **kwargs)
+                time.sleep(0.01)
+                return value
+
+        store = CacheWindowStore()
+        patcher = mock.patch(
+            "apps.accounts.managers.throttling.caches",
+            {"default": SlowCache()},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        start = threading.Barrier(20)
+        results = []
+
+        def attempt():
+            start.wait()
+            results.append(store.hit("k", 5, 60))
+
+        threads = [threading.Thread(target=attempt) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(None), 5)
+        self.assertIsNotNone(store.hit("k", 5, 60))
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        "DEFAULT_AUTHENTICATION_CLASSES": (
+            "apps.accounts.authentication.ClaimsJWTAuthentication",
+        ),
+        "DEFAULT_THROTTLE_RATES": RATES,
+    }
+)
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        local_store.clear()
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("auth-login")
+        User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+
+    def login(self, email="user1@example.com", ip="198.51.100.1"):
+        return self.client.post(
+            self.url, {"email": email, "password": "errada123"},
+            format="json", REMOTE_ADDR=ip,
+        )
+
+    def test_email_limit_rejects_before_queries(self):
+        for _ in range(2):
+            self.assertEqual(
+                self.login(" USER1@example.com").status_code,
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.login(ip="198.51.100.2")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS) # noqa E501
+        self.assertIn("Retry-After", response)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_ip_limit(self):
+        for i in range(5):
+            self.login(email=f"other{i}@example.com")
+
+        response = self.login(email="new@example.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS) # noqa E501
+
+        # outro IP continua podendo tentar
+        response = self.login(email="new@example.com", ip="198.51.100.9")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cache_store(self):
+        with self.settings(LOGIN_THROTTLE_STORE="cache"):
+            for _ in range(2):
+                self.login()
+            response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS) # noqa E501
+        self.assertEqual(len(local_store._entries), 0)
+
+    def test_disabled(self):
+        with self.settings(LOGIN_THROTTLE_ENABLED=False):
+            for _ in range(3):
+                response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_google_ip_limit(self):
+        url = reverse("auth-google")
+        self.client.post(url, {}, format="json")
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS) # noqa E501
+
+    async def test_async_login(self):
+        factory = AsyncRequestFactory()
+        view = AsyncLoginAPIView.as_view()
+        for expected in (400, 400, 429):
+            request = factory.post(
+                self.url,
+                {"email": "user1@example.com", "password": "errada123"},
+                content_type="application/json",
+            )
+            response = await view(request)
+            self.assertEqual(response.status_code, expected)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken, OutstandingToken,
+)
+from apps.accounts.managers.token_pruning import prune_expired_tokens
+
+User = get_user_model()
+
+
+class TokenPruningTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+        now = timezone.now()
+        OutstandingToken.objects.bulk_create([
+            OutstandingToken(
+                user=self.user, jti=f"expirado-{i}", token="x",
+                created_at=now - timedelta(days=2),
+                expires_at=now - timedelta(days=1),
+            )
+            for i in range(5)
+        ] + [
+            OutstandingToken(
+                user=self.user, jti=f"valido-{i}", token="x",
+                created_at=now, expires_at=now + timedelta(days=1),
+            )
+            for i in range(2)
+        ])
+        tokens = OutstandingToken.objects.order_by("id")
+        BlacklistedToken.objects.bulk_create([
+            BlacklistedToken(token=tokens[0]),
+            BlacklistedToken(token=tokens[1]),
+            BlacklistedToken(token=tokens[6]),
+        ])
+
+    def test_removes_only_expired_in_batches(self):
+        result = prune_expired_tokens(batch_size=2)
+
+        self.assertEqual(result["outstanding"], 5)
+        self.assertEqual(result["blacklisted"], 2)
+        self.assertEqual(result["batches"], 3)
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list("jti", flat=True)),
+            {"valido-0", "valido-1"},
+        )
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_resumes_where_it_stopped(self):
+        first = prune_expired_tokens(batch_size=2, max_batches=1)
+        self.assertEqual(first["outstanding"], 2)
+        self.assertEqual(OutstandingToken.objects.count(), 5)
+
+        second = prune_expired_tokens(batch_size=2)
+        self.assertEqual(second["outstanding"], 3)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+
+    def test_stops_after_max_seconds(self):
+        ticks = iter(range(100))
+        result = prune_expired_tokens(
+            batch_size=1, max_seconds=2, clock=lambda: next(ticks),
+        )
+        self.assertEqual(result["batches"], 2)
+
+    def test_command_reports(self):
+        out = StringIO()
+        call_command(
+            "prune_expired_tokens", "--batch-size", "10", "--pause", "0",
+            stdout=out,
+        )
+        self.assertIn("5 tokens expirados removidos (2 da blacklist)",
+                      out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+
+    def test_loop_refreshes_connection_each_round(self):
+        command = "apps.accounts.management.commands.prune_expired_tokens"
+        with mock.patch(f"{command}.close_old_connections") as close, \
+                mock.patch(f"{command}.time.sleep",
+                           side_effect=[None, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command(
+                    "prune_expired_tokens", "--loop", "--pause", "0",
+                    stdout=StringIO(),
+                )
+        self.assertEqual(close.call_count, 2)
@@ -0,0 +1,172 @@
+import threading
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken # noqa E501
+
+from apps.accounts.managers.revocation import RevokedTokenIndex, revoked_tokens
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+class TokenRefreshAPIViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("token_refresh")
+        revoked_tokens.reset()
+
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+        self.refresh = UserRefreshToken.for_user(self.user)
+
+    def test_refresh_success(self):
+        response = self.client.post(
+            self.url, {"refresh": str(self.refresh)}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+
+    def test_refresh_skips_blacklist_query_for_unrevoked_token(self):
+        revoked_tokens.sync(force=True)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.url, {"refresh": str(self.refresh)}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(
+            "token_blacklist_blacklistedtoken" in q["sql"]
+            for q in ctx.captured_queries
+        ))
+
+    def test_refresh_blacklisted_token_rejected(self):
+        self.refresh.blacklist()
+
+        response = self.client.post(
+            self.url, {"refresh": str(self.refresh)}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RevokedTokenIndexTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+
+    def test_loads_revoked_tokens_from_database(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        refresh.blacklist()
+        other = UserRefreshToken.for_user(self.user)
+
+        index = RevokedTokenIndex(sync_interval=60)
+
+        self.assertTrue(index.might_contain(refresh["jti"]))
+        self.assertFalse(index.might_contain(other["jti"]))
+        self.assertEqual(len(index), BlacklistedToken.objects.count())
+
+    def test_syncs_only_after_interval(self):
+        now = [0.0]
+        index = RevokedTokenIndex(sync_interval=5, clock=lambda: now[0])
+        index.sync()
+
+        refresh = UserRefreshToken.for_user(self.user)
+        refresh.blacklist()
+
+        with self.assertNumQueries(0):
+            self.assertFalse(index.might_contain(refresh["jti"]))
+
+        now[0] += 6
+        self.assertTrue(index.might_contain(refresh["jti"]))
+
+    def test_burst_larger_than_page(self):
+        tokens = [UserRefreshToken.for_user(self.user) for _ in range(5)]
+        for token in tokens:
+            token.blacklist()
+
+        fresh = RevokedTokenIndex(sync_interval=0)
+        fresh.page_size = 2
+        fresh.sync()
+        self.assertTrue(all(fresh.might_contain(t["jti"]) for t in tokens))
+
+    def test_rereads_skipped_ids(self):
+        tokens = [UserRefreshToken.for_user(self.user) for _ in range(3)]
+        outstanding = list(OutstandingToken.objects.order_by("id"))
+        BlacklistedToken.objects.create(id=10, token=outstanding[0])
+
+        index = RevokedTokenIndex(sync_interval=0, reload_interval=3600)
+        index.sync()
+        BlacklistedToken.objects.create(id=12, token=outstanding[2])
+        index.sync()
+        self.assertEqual(index._gaps[0][:2], (11, 11))
+
+        # a transação que alocou o id 11 termina depois
+        BlacklistedToken.objects.create(id=11, token=outstanding[1])
+        self.assertTrue(index.might_contain(tokens[1]["jti"]))
+        self.assertEqual(index._gaps, [])
+
+    def test_reload_drops_expired(self):
+        now = [0.0]
+        index = RevokedTokenIndex(
+            sync_interval=0, reload_interval=10, clock=lambda: now[0]
+        )
+        index.sync()
+        index.add("vencido", timezone.now() - timedelta(seconds=1))
+        index.add("valido", timezone.now() + timedelta(hours=1))
+
+        now[0] += 11
+        index.sync()
+
+        self.assertFalse(index.might_contain("vencido"))
+        self.assertTrue(index.might_contain("valido"))
+        self.assertEqual(len(index), 1)
+
+    def test_add_during_reload(self):
+        index = RevokedTokenIndex(sync_interval=0, reload_interval=0)
+        expires_at = timezone.now() + timedelta(hours=1)
+        for i in range(200_000):
+            index.add(f"antigo-{i}", expires_at)
+
+        # logouts chegando enquanto o índice é reconstruído
+        errors = []
+        done = threading.Event()
+
+        def logouts():
+            i = 0
+            while not done.is_set():
+                index.add(f"novo-{i}", expires_at)
+                i += 1
+            index.added = i
+
+        thread = threading.Thread(target=logouts)
+        thread.start()
+        try:
+            for _ in range(5):
+                try:
+                    index.sync(force=True)
+                except RuntimeError as e:
+                    errors.append(e)
+        finally:
+            done.set()
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(all(
+            index.might_contain(f"novo-{i}") for i in range(index.added)
+        ))
@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+def bearer(client, user):
+    access = UserRefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+
+@override_settings(USER_PAYLOAD_CACHE_LOCAL=True)
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+        self.detail_url = reverse(
+            "admin-user-detail", kwargs={"user_id": self.user.id}
+        )
+
+    def test_detail_etag_and_304(self):
+        bearer(self.client, self.admin)
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.detail_url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_detail_if_modified_since(self):
+        bearer(self.client, self.admin)
+
+        response = self.client.get(self.detail_url)
+        response = self.client.get(
+            self.detail_url,
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_save_invalidates_cached_payload(self):
+        bearer(self.client, self.admin)
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        self.user.first_name = "Novo"
+        self.user.username = "user1-novo"
+        self.user.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "user1-novo")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_delete_invalidates_cached_payload(self):
+        bearer(self.client, self.admin)
+        self.client.get(self.detail_url)
+
+        self.client.delete(self.detail_url)
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_me_etag_matches_detail(self):
+        bearer(self.client, self.admin)
+        detail_etag = self.client.get(self.detail_url)["ETag"]
+
+        cache.clear()
+        bearer(self.client, self.user)
+        response = self.client.get(reverse("me"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], detail_etag)
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(
+            reverse("me"), HTTP_IF_NONE_MATCH=detail_etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_depends_on_media_type(self):
+        bearer(self.client, self.admin)
+        json_etag = self.client.get(self.detail_url)["ETag"]
+
+        response = self.client.get(
+            self.detail_url, HTTP_ACCEPT="text/html",
+            HTTP_IF_NONE_MATCH=json_etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], json_etag)
+        self.assertIn("Accept", response["Vary"])
+
+    @override_settings(USER_PAYLOAD_CACHE_LOCAL=False)
+    def test_local_cache_not_used_by_default(self):
+        bearer(self.client, self.admin)
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        # escrita feita em outro worker: a invalidação não chega aqui
+        User.objects.filter(pk=self.user.pk).update(username="outro")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "outro")
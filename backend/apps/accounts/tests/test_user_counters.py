@@ -0,0 +1,172 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.accounts.managers.batch_users import BatchUserManager
+from apps.accounts.managers.bulk_import import BulkImportManager
+from apps.accounts.models import UserCounters
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+def counters():
+    row = UserCounters.objects.get(pk=1)
+    return row.total, row.active, row.superusers
+
+
+class UserCountersTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.user = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+
+    def test_create_save_and_delete(self):
+        self.assertEqual(counters(), (2, 2, 1))
+
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(counters(), (2, 1, 1))
+
+        # salvar de novo sem mudar nada não altera os contadores
+        user.first_name = "Novo"
+        user.save()
+        self.assertEqual(counters(), (2, 1, 1))
+
+        user.delete()
+        self.assertEqual(counters(), (1, 1, 1))
+
+    def test_batch_operations(self):
+        other = User.objects.create_user(
+            username="user2",
+            email="user2@example.com",
+            password="user12345"
+        )
+        manager = BatchUserManager()
+
+        manager.run("deactivate", [self.user.id, other.id])
+        self.assertEqual(counters(), (3, 1, 1))
+
+        manager.run("activate", [self.user.id])
+        self.assertEqual(counters(), (3, 2, 1))
+
+        manager.run("delete", [self.user.id, other.id, self.admin.id])
+        self.assertEqual(counters(), (0, 0, 0))
+
+    def test_bulk_import(self):
+        upload = SimpleUploadedFile(
+            "users.csv",
+            b"username,email,password\n"
+            b"user2,user2@example.com,senhaforte123\n"
+            b"user3,user3@example.com,senhaforte123\n",
+        )
+        report = BulkImportManager().run(upload, "csv")
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(counters(), (4, 4, 1))
+
+    def test_queryset_update(self):
+        # update() não dispara sinais: a variação vem do próprio queryset
+        User.objects.filter(is_superuser=False).update(is_active=False)
+        self.assertEqual(counters(), (2, 1, 1))
+
+        User.objects.all().update(is_active=True, is_superuser=True)
+        self.assertEqual(counters(), (2, 2, 2))
+
+    def test_counter_failure_rolls_back_write(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        with mock.patch(
+            "apps.accounts.managers.user_counters.apply_delta",
+            side_effect=DatabaseError,
+        ):
+            with self.assertRaises(DatabaseError):
+                user.save()
+            with self.assertRaises(DatabaseError):
+                User.objects.filter(pk=self.admin.pk).update(is_active=False)
+
+        self.assertEqual(
+            set(User.objects.values_list("is_active", flat=True)), {True}
+        )
+        self.assertEqual(counters(), (2, 2, 1))
+
+    def test_reconcile_command(self):
+        UserCounters.objects.filter(pk=1).update(total=10, active=0)
+        out = StringIO()
+
+        call_command("reconcile_user_counters", stdout=out)
+
+        self.assertEqual(counters(), (2, 2, 1))
+        self.assertIn("total: 2 (corrigido em -8)", out.getvalue())
+
+
+class UserListCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        for i in range(3):
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="user12345",
+                is_active=i != 0,
+            )
+        access = UserRefreshToken.for_user(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.url = reverse("admin-user-list")
+
+    def get(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, params)
+        sql = [q["sql"] for q in ctx.captured_queries]
+        return response, any("COUNT(" in q for q in sql)
+
+    def test_count_from_counters(self):
+        for params, expected in (
+            ({}, 4),
+            ({"is_active": "true"}, 3),
+            ({"is_active": "false"}, 1),
+            ({"is_superuser": "true"}, 1),
+        ):
+            response, counted = self.get(params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], expected)
+            self.assertFalse(counted, params)
+
+    def test_other_filters_use_count(self):
+        response, counted = self.get({"username": "user"})
+        self.assertEqual(response.data["count"], 3)
+        self.assertTrue(counted)
+
+        response, counted = self.get({"is_active": "true", "username": "u"})
+        self.assertEqual(response.data["count"], 2)
+        self.assertTrue(counted)
+
+    def test_exact_mode(self):
+        UserCounters.objects.filter(pk=1).update(total=99)
+        with self.settings(USER_COUNT_MODE="exact"):
+            response, counted = self.get({})
+        self.assertEqual(response.data["count"], 4)
+        self.assertTrue(counted)
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+from apps.accounts.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+class UserExportAPIViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("admin-user-export")
+
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@admin.com",
+            password="admin123"
+        )
+        self.user1 = User.objects.create_user(
+            username="user1",
+            email="user1@example.com",
+            password="user12345"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2",
+            email="user2@example.com",
+            password="user12345",
+            is_active=False,
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        body = self.read(self.client.get(self.url))
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(
+            [r["id"] for r in rows],
+            [self.admin.id, self.user1.id, self.user2.id],
+        )
+        self.assertEqual(rows[1]["email"], "user1@example.com")
+        self.assertNotIn("password", rows[1])
+
+    async def test_export_streams_async_under_asgi(self):
+        access = await sync_to_async(
+            lambda: str(UserRefreshToken.for_user(self.admin).access_token)
+        )()
+
+        response = await self.async_client.get(
+            self.url, {"output": "csv"},
+            headers={"Authorization": f"Bearer {access}"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # conteúdo async: o Django envia parte a parte, sem list() no meio
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 4)
+        self.assertTrue(chunks[0].startswith(b"id,username,email"))
+
+    def test_export_csv_with_filters(self):
+        response = self.client.get(
+            self.url, {"output": "csv", "is_active": "false"}
+        )
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["username"], "user2")
+
+    def test_export_with_search(self):
+        response = self.client.get(self.url, {"q": "user2"})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+
+        self.assertEqual([r["username"] for r in rows], ["user2"])
+
+    def test_export_invalid_output(self):
+        response = self.client.get(self.url, {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_forbidden_for_normal_user(self):
+        self.client.force_authenticate(user=self.user1)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_supports_same_filters(self):
+        response = self.client.get(
+            reverse("admin-user-list"), {"username": "user"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {u["id"] for u in response.data["results"]},
+            {self.user1.id, self.user2.id},
+        )
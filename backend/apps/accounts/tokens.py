@@ -0,0 +1,64 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from apps.accounts.managers.outstanding_tokens import (
+    buffering_enabled, outstanding_tokens,
+)
+from apps.accounts.managers.revocation import revoked_tokens
+
+TOKEN_VERSION_CLAIM = "ver"
+UPDATED_AT_CLAIM = "updated_at"
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token que carrega os dados públicos do usuário nos claims.
+    O access token derivado herda esses claims, o que permite autenticar
+    sem ler o usuário do banco (ver `ClaimsJWTAuthentication`).
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        if buffering_enabled():
+            # pula o INSERT do BlacklistMixin; o registro vai para a fila
+            token = super(BlacklistMixin, cls).for_user(user)
+        else:
+            token = super().for_user(user)
+        token["username"] = user.username
+        token["email"] = user.email
+        token["avatar"] = user.avatar.name if user.avatar else None
+        token["avatar_hash"] = user.avatar_hash
+        token["is_superuser"] = user.is_superuser
+        token["is_active"] = user.is_active
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        if user.updated_at is not None:
+            token[UPDATED_AT_CLAIM] = int(user.updated_at.timestamp())
+        if buffering_enabled():
+            token.enqueue_outstanding(user.pk)
+        return token
+
+    def enqueue_outstanding(self, user_id):
+        from rest_framework_simplejwt.token_blacklist.models import (
+            OutstandingToken,
+        )
+
+        outstanding_tokens.add(OutstandingToken(
+            user_id=user_id,
+            jti=self.payload[api_settings.JTI_CLAIM],
+            token=str(self),
+            created_at=self.current_time,
+            expires_at=datetime_from_epoch(self.payload["exp"]),
+        ))
+
+    def outstand(self):
+        # rotação com a fila ligada: o novo token também é enfileirado
+        if not buffering_enabled():
+            return super().outstand()
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        self.enqueue_outstanding(int(user_id) if user_id else None)
+        return None
+
+    def check_blacklist(self):
+        # só consulta a blacklist no banco se o JTI pode estar revogado
+        if revoked_tokens.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
@@ -0,0 +1,130 @@
+"""
+Leituras na réplica (DATABASE_REPLICAS), só nos handlers marcados com
+`replica_reads`; o resto continua no banco principal.
+
+Read-your-writes: depois de uma escrita, o usuário que escreveu e os
+usuários alterados ficam "presos" ao principal por REPLICA_PIN_SECONDS
+(maior que o atraso de replicação esperado). A marca fica no cache do
+Django, compartilhado entre os workers: com réplica configurada as
+settings exigem REDIS_URL.
+"""
+import functools
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+PIN_KEY = "db:pin:{}"
+
+# leituras do contexto atual podem ir para a réplica
+_replica_allowed = ContextVar("replica_allowed", default=False)
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def _pin_keys(user_ids):
+    return [PIN_KEY.format(user_id) for user_id in user_ids if user_id]
+
+
+def pin_primary(*user_ids):
+    """Mantém as leituras destes usuários no principal por um tempo."""
+    keys = _pin_keys(user_ids)
+    if replicas() and keys:
+        timeout = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+        cache.set_many(dict.fromkeys(keys, 1), timeout)
+
+
+async def apin_primary(*user_ids):
+    keys = _pin_keys(user_ids)
+    if replicas() and keys:
+        timeout = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+        await cache.aset_many(dict.fromkeys(keys, 1), timeout)
+
+
+def pin_primary_on_commit(*user_ids):
+    if replicas():
+        transaction.on_commit(lambda: pin_primary(*user_ids))
+
+
+def is_pinned(*user_ids):
+    keys = _pin_keys(user_ids)
+    return bool(keys) and bool(cache.get_many(keys))
+
+
+async def ais_pinned(*user_ids):
+    keys = _pin_keys(user_ids)
+    return bool(keys) and bool(await cache.aget_many(keys))
+
+
+@contextmanager
+def _allow_replica(allowed):
+    token = _replica_allowed.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_allowed.reset(token)
+
+
+def _subjects(request, kwargs):
+    # quem pede e, no detalhe, o usuário pedido
+    return getattr(request.user, "pk", None), kwargs.get("user_id")
+
+
+def replica_reads(handler):
+    """
+    Decorator de método de view (sync ou async): as leituras feitas pelo
+    handler vão para a réplica, a menos que alguma das partes esteja
+    presa ao principal. A autenticação roda antes e lê do principal.
+    """
+    if iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def async_wrapper(self, request, *args, **kwargs):
+            allowed = bool(replicas()) and not await ais_pinned(
+                *_subjects(request, kwargs)
+            )
+            with _allow_replica(allowed):
+                return await handler(self, request, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        allowed = bool(replicas()) and not is_pinned(
+            *_subjects(request, kwargs)
+        )
+        with _allow_replica(allowed):
+            return handler(self, request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not replicas():
+            return None
+        if _replica_allowed.get():
+            return random.choice(replicas())
+        # também para objetos lidos da réplica (hint `instance`)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if not replicas():
+            return None
+        # o resto deste contexto lê o que acabou de ser escrito
+        _replica_allowed.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # réplicas têm os mesmos dados do principal
+        if replicas():
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replicas():
+            return False
+        return None
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import permissions
+
+# O drf-yasg só é importado quando o schema ou as telas são pedidos
+# (ver `schema_view`): a subida dos workers não paga esse import.
+
+
+def api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="GERENCIAMENTO DE USUÁRIOS API",
+        default_version='v1',
+        description="CLIENT_API",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="contact@snippets.local"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+# diretórios cujo código muda o schema
+SOURCE_DIRS = ("apps", "core")
+
+
+def code_version():
+    """
+    Versão do código para o schema: CODE_VERSION (ex.: SHA do commit,
+    definido no deploy) ou um hash dos .py do projeto.
+    """
+    version = getattr(settings, "CODE_VERSION", "")
+    if version:
+        return version
+
+    digest = hashlib.blake2b(digest_size=8)
+    base = Path(settings.BASE_DIR)
+    for directory in SOURCE_DIRS:
+        for path in sorted((base / directory).rglob("*.py")):
+            digest.update(str(path.relative_to(base)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _etag(body):
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class SchemaCache:
+    """
+    Schema OpenAPI gerado uma vez por versão do código.
+
+    O JSON fica em memória e em disco (`OPENAPI_SCHEMA_DIR`, um arquivo
+    por versão): os workers que sobem depois do `build_openapi_schema`
+    só leem o arquivo, sem percorrer as views. O YAML é convertido do
+    JSON na primeira vez que é pedido.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+
+    @property
+    def version(self):
+        if self._version is None:
+            self._version = code_version()
+        return self._version
+
+    def path(self):
+        directory = Path(getattr(settings, "OPENAPI_SCHEMA_DIR", ""))
+        return directory / f"openapi-{self.version}.json"
+
+    def get(self, fmt="json"):
+        """(corpo, etag) do schema em `fmt` ('json' ou 'yaml')."""
+        entry = self._entries.get(fmt)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(fmt)
+                if entry is None:
+                    entry = self._entries[fmt] = self._load(fmt)
+        return entry
+
+    def _load(self, fmt):
+        if fmt == "yaml":
+            from drf_yasg.codecs import OpenAPICodecYaml
+
+            if "json" not in self._entries:
+                self._entries["json"] = self._load("json")
+            body, _ = self._entries["json"]
+            spec = json.loads(body, object_pairs_hook=OrderedDict)
+            body = OpenAPICodecYaml([])._dump_dict(spec)
+            return body, _etag(body)
+
+        try:
+            body = self.path().read_bytes()
+        except OSError:
+            body = self.build()
+        return body, _etag(body)
+
+    def build(self):
+        """Gera o schema e grava o arquivo desta versão."""
+        from drf_yasg.codecs import OpenAPICodecJson
+        from drf_yasg.generators import OpenAPISchemaGenerator
+
+        generator = OpenAPISchemaGenerator(api_info())
+        # sem request: o schema não depende de quem pediu (host incluso)
+        body = OpenAPICodecJson([]).encode(
+            generator.get_schema(request=None, public=True)
+        )
+
+        path = self.path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except OSError:
+            # sem disco gravável: fica só em memória neste processo
+            pass
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._entries.clear()
+
+
+schema_cache = SchemaCache()
+
+
+def get_schema_view():
+    """
+    SchemaView do drf-yasg que serve o JSON/YAML do `schema_cache`, com
+    ETag (304 quando o cliente já tem o schema). As telas do Swagger UI e
+    do ReDoc continuam com o drf-yasg, que não percorre as views para
+    montá-las.
+    """
+    from drf_yasg.codecs import OpenAPICodecYaml
+    from drf_yasg.renderers import _SpecRenderer
+    from drf_yasg.views import get_schema_view as yasg_schema_view
+
+    base = yasg_schema_view(
+        api_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+        authentication_classes=(),
+    )
+
+    class CachedSchemaView(base):
+        def get(self, request, version="", format=None):
+            renderer = request.accepted_renderer
+            if not isinstance(renderer, _SpecRenderer):
+                return super().get(request, version, format)
+
+            fmt = "yaml" if renderer.codec_class is OpenAPICodecYaml else "json" # noqa E501
+            body, etag = schema_cache.get(fmt)
+            response = HttpResponse(
+                body,
+                content_type=f"{renderer.media_type}; charset=utf-8",
+            )
+            response["ETag"] = etag
+            response["Cache-Control"] = "no-cache"
+            return get_conditional_response(
+                request, etag=etag, response=response
+            )
+
+    return CachedSchemaView
+
+
+def schema_view(name, *args):
+    """
+    View para o URLconf que só monta `get_schema_view().<name>(*args)`
+    (e importa o drf-yasg) no primeiro acesso.
+    """
+    view = None
+
+    @csrf_exempt
+    def lazy_view(request, *view_args, **view_kwargs):
+        nonlocal view
+        if view is None:
+            view = getattr(get_schema_view(), name)(*args)
+        return view(request, *view_args, **view_kwargs)
+
+    return lazy_view
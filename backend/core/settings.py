@@ -12,8 +12,10 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 from dotenv import load_dotenv
 from datetime import timedelta
+from importlib.util import find_spec
 import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -55,12 +57,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.accounts.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.accounts.middleware.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -95,20 +99,79 @@ WSGI_APPLICATION = 'core.wsgi.application'
 #     }
 # }
 
-DATABASES = {
-    'default': {
+# Conexões: DB_CONN_MAX_AGE (s) reaproveita a conexão entre requisições
+# do mesmo worker, com checagem antes do reuso (DB_CONN_HEALTH_CHECKS).
+# DB_POOL=True usa o pool do Django (exige psycopg 3 com psycopg-pool);
+# nesse caso CONN_MAX_AGE fica 0, o pool é quem guarda as conexões.
+DB_POOL = os.getenv('DB_POOL', 'False').lower() in ('true', '1', 'yes')
+if DB_POOL and (find_spec('psycopg') is None or find_spec('psycopg_pool') is None): # noqa E501
+    raise ImproperlyConfigured(
+        "DB_POOL=True exige psycopg 3 com pool "
+        "(pip install \"psycopg[binary,pool]\"); o requirements.txt instala "
+        "o psycopg2, que não tem pool."
+    )
+
+
+def database(host, port):
+    options = {'options': '-c client_encoding=UTF8'}
+    if DB_POOL:
+        options['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
+    return {
         'ENGINE': os.getenv('DB_ENGINE'),
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT'),
-        'OPTIONS': {
-            'options': '-c client_encoding=UTF8',
-        },
+        'HOST': host,
+        'PORT': port,
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '60')), # noqa E501
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() in ('true', '1', 'yes'), # noqa E501
+        'OPTIONS': options,
     }
+
+
+DATABASES = {
+    'default': database(os.getenv('DB_HOST'), os.getenv('DB_PORT')),
 }
 
+# Cache do Django. REDIS_URL liga o Redis, compartilhado entre os
+# processos; sem ele cada processo tem o seu cache em memória (LocMem).
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Réplica de leitura opcional (DB_REPLICA_HOST), usada só pelas views
+# marcadas com `replica_reads` (ver core/db_router.py). Depois de uma
+# escrita, quem escreveu e os usuários alterados leem do principal por
+# REPLICA_PIN_SECONDS. A marca fica no cache, que precisa ser visto por
+# todos os workers: a réplica exige REDIS_URL.
+DATABASE_REPLICAS = []
+if os.getenv('DB_REPLICA_HOST'):
+    if not REDIS_URL:
+        raise ImproperlyConfigured(
+            "DB_REPLICA_HOST exige REDIS_URL: sem cache compartilhado a "
+            "leitura logo após uma escrita pode cair em outro worker e ir "
+            "para a réplica atrasada."
+        )
+    DATABASES['replica'] = database(
+        os.getenv('DB_REPLICA_HOST'),
+        os.getenv('DB_REPLICA_PORT', os.getenv('DB_PORT')),
+    )
+    # nos testes a réplica é o próprio banco de teste
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS = ['replica']
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = float(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -127,6 +190,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Pool de processos para hash/verificação de senhas. WORKERS=0 executa na
+# própria thread. MAX_PENDING limita as operações em andamento; acima dele
+# a requisição espera até ACQUIRE_TIMEOUT segundos e então recebe 503.
+PASSWORD_HASHING = {
+    'WORKERS': int(os.getenv('PASSWORD_HASHING_WORKERS', min(4, os.cpu_count() or 1))), # noqa E501
+    'MAX_PENDING': int(os.getenv('PASSWORD_HASHING_MAX_PENDING', '16')),
+    'ACQUIRE_TIMEOUT': float(os.getenv('PASSWORD_HASHING_ACQUIRE_TIMEOUT', '2')), # noqa E501
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
@@ -152,6 +224,9 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Tamanhos (px) das miniaturas geradas para cada avatar
+AVATAR_SIZES = (64, 256)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -159,19 +234,37 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'accounts.Usuario'
 
+AUTHENTICATION_BACKENDS = [
+    'apps.accounts.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
         'rest_framework.permissions.DjangoModelPermissions',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'], # noqa E501
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination', # noqa E501
-    'PAGE_SIZE': 10
+    'DEFAULT_PAGINATION_CLASS': 'apps.accounts.apis.pagination.UserLimitOffsetPagination', # noqa E501
+    'PAGE_SIZE': 10,
+    # login e login Google (janela deslizante, ver managers/throttling.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('LOGIN_THROTTLE_IP_RATE', '30/min'),
+        'login_email': os.getenv('LOGIN_THROTTLE_EMAIL_RATE', '10/min'),
+        'google_ip': os.getenv('GOOGLE_THROTTLE_IP_RATE', '30/min'),
+    },
 }
 
+# Limite de tentativas de login, checado antes de consultar o banco ou
+# calcular o hash. STORE: 'local' (memória do processo, sem I/O) ou
+# 'cache' (cache do Django, compartilhado se for Redis/Memcached; contadores
+# atômicos por sub-janela).
+LOGIN_THROTTLE_ENABLED = os.getenv('LOGIN_THROTTLE_ENABLED', 'True').lower() in ('true', '1', 'yes') # noqa E501
+LOGIN_THROTTLE_STORE = os.getenv('LOGIN_THROTTLE_STORE', 'local')
+
 # SIMPLE JWT
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=45),
@@ -179,8 +272,78 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.apis.serializers.UserTokenRefreshSerializer", # noqa E501
 }
 
+# Tempo (s) que a versão dos tokens de cada usuário fica em cache. Com um
+# cache local por processo (LocMem) este é o atraso máximo para que uma
+# revogação feita em outro processo seja vista.
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.getenv("TOKEN_VERSION_CACHE_TIMEOUT", "60")) # noqa E501
+
+# Tempo (s) que o payload serializado de cada usuário (/me e detalhe)
+# fica em cache; salvar ou remover o usuário apaga a entrada no cache do
+# processo que salvou. Por isso só é usado com cache compartilhado
+# (Redis/Memcached); USER_PAYLOAD_CACHE_LOCAL=True usa o cache local
+# (LocMem) quando há um único processo. Sem cache o ETag continua valendo.
+USER_PAYLOAD_CACHE_TIMEOUT = int(os.getenv("USER_PAYLOAD_CACHE_TIMEOUT", "300")) # noqa E501
+USER_PAYLOAD_CACHE_LOCAL = os.getenv("USER_PAYLOAD_CACHE_LOCAL", "False").lower() in ("true", "1", "yes") # noqa E501
+
+# Origem do `count` da listagem paginada: 'counters' (tabela
+# UserCounters, mantida a cada escrita), 'estimate' (total sem filtro pela
+# estimativa do Postgres, sem precisão) ou 'exact' (COUNT(*) sempre).
+USER_COUNT_MODE = os.getenv("USER_COUNT_MODE", "counters")
+
+# Linhas aceitas por importação via API (hash das senhas e INSERTs rodam
+# dentro da requisição); arquivos maiores vão pelo `manage.py import_users`.
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "5000"))
+
+# Intervalo (s) entre as leituras incrementais da blacklist feitas pelo
+# índice de tokens revogados de cada processo: é o tempo máximo em que um
+# token revogado em outro processo ainda é aceito (0 = lê a cada
+# verificação). A cada REVOCATION_RELOAD_INTERVAL o índice é recarregado
+# do zero, descartando os tokens já expirados.
+REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "2")) # noqa E501
+REVOCATION_RELOAD_INTERVAL = float(os.getenv("REVOCATION_RELOAD_INTERVAL", "600")) # noqa E501
+
+# Fila de OutstandingToken: com OUTSTANDING_TOKEN_BUFFER ligado o login
+# não grava o registro do refresh token na hora; cada processo grava em
+# lote a cada OUTSTANDING_TOKEN_FLUSH_INTERVAL segundos ou quando a fila
+# chega a OUTSTANDING_TOKEN_BUFFER_SIZE itens. Até lá a blacklist não
+# alcança o token; a revogação de todos os tokens de um usuário vale pela
+# versão dos tokens (claim "ver"), conferida também no refresh.
+OUTSTANDING_TOKEN_BUFFER = os.getenv("OUTSTANDING_TOKEN_BUFFER", "False").lower() in ("true", "1", "yes") # noqa E501
+OUTSTANDING_TOKEN_FLUSH_INTERVAL = float(os.getenv("OUTSTANDING_TOKEN_FLUSH_INTERVAL", "1")) # noqa E501
+OUTSTANDING_TOKEN_BUFFER_SIZE = int(os.getenv("OUTSTANDING_TOKEN_BUFFER_SIZE", "500")) # noqa E501
+
+# Views async (login, me, google, lista/detalhe de usuários) nas mesmas
+# URLs. Só faz sentido servindo via ASGI (uvicorn core.asgi:application);
+# sob WSGI cada view async roda num event loop próprio por requisição.
+ASYNC_API_VIEWS = os.getenv("ASYNC_API_VIEWS", "False").lower() in ("true", "1", "yes") # noqa E501
+
+# Métricas por endpoint em /metrics (formato Prometheus), liberadas para
+# super usuários ou para as redes abaixo (endereço de quem conectou).
+# Por padrão só o próprio host: atrás do docker-compose ou de um proxy
+# reverso todo cliente externo chega com endereço de rede privada, então
+# liberar as redes privadas (METRICS_ALLOW_PRIVATE_NETWORKS) é opcional.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() in ("true", "1", "yes") # noqa E501
+METRICS_ALLOWED_NETWORKS = [
+    n.strip() for n in os.getenv(
+        "METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128",
+    ).split(",") if n.strip()
+]
+if os.getenv("METRICS_ALLOW_PRIVATE_NETWORKS", "False").lower() in ("true", "1", "yes"): # noqa E501
+    METRICS_ALLOWED_NETWORKS += ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"] # noqa E501
+
+# Schema OpenAPI pré-gerado (core/openapi.py): um arquivo por versão do
+# código em OPENAPI_SCHEMA_DIR. CODE_VERSION (ex.: SHA do commit) evita
+# calcular a versão pelo hash dos fontes na subida.
+OPENAPI_SCHEMA_DIR = os.getenv("OPENAPI_SCHEMA_DIR", str(BASE_DIR / "var" / "openapi")) # noqa E501
+CODE_VERSION = os.getenv("CODE_VERSION", "")
+
+# Orçamento (ms) de imports na subida de um worker, checado pelo
+# `manage.py startup_report` (0 = só relatório).
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "0")) # noqa E501
+
 # SWAGGER
 SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,
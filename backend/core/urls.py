@@ -2,48 +2,48 @@ from django.contrib import admin
 from django.urls import path
 from django.conf.urls.static import static
 from apps.accounts.apis.google_oauth import GoogleAuthAPIView
-from drf_yasg.views import get_schema_view
 from rest_framework_simplejwt.views import TokenRefreshView
-from apps.accounts.apis.viewsets import LoginAPIView, LogoutAPIView, MeAPIView, RegisterAPIView, UserDetailAPIView, UserListAPIView # noqa E501
+from apps.accounts.apis.viewsets import LoginAPIView, LogoutAPIView, MeAPIView, RegisterAPIView, UserBatchAPIView, UserBulkImportAPIView, UserDetailAPIView, UserExportAPIView, UserListAPIView # noqa E501
+from apps.accounts.apis.metrics import MetricsAPIView
+from apps.accounts.apis.async_views import AsyncGoogleAuthAPIView, AsyncLoginAPIView, AsyncMeAPIView, AsyncUserDetailAPIView, AsyncUserListAPIView # noqa E501
 from core import settings
-from drf_yasg import openapi
-from rest_framework import permissions
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="GERENCIAMENTO DE USUÁRIOS API",
-        default_version='v1',
-        description="CLIENT_API",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@snippets.local"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from core.openapi import schema_view
+
+
+def api_view(sync_view, async_view):
+    # com ASYNC_API_VIEWS=True (servindo via ASGI) usa as views async
+    view = async_view if settings.ASYNC_API_VIEWS else sync_view
+    return view.as_view()
 
 
 urlpatterns = [
     # swagger
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0),name='schema-json'), # noqa E501
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'), # noqa E501
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'), # noqa E501
+    # schema pré-gerado (manage.py build_openapi_schema), servido com ETag
+    path('swagger<format>/', schema_view('without_ui'), name='schema-json'), # noqa E501
+    path('swagger/', schema_view('with_ui', 'swagger'), name='schema-swagger-ui'), # noqa E501
+    path('redoc/', schema_view('with_ui', 'redoc'), name='schema-redoc'), # noqa E501
 
     path('admin/', admin.site.urls),
 
+    # métricas (Prometheus)
+    path('metrics', MetricsAPIView.as_view(), name='metrics'),
+
     # AUTH (JWT)
     path('api/v1/auth/register/', RegisterAPIView.as_view(), name='auth-register'), # noqa E501
-    path('api/v1/auth/login/', LoginAPIView.as_view(), name='auth-login'),
+    path('api/v1/auth/login/', api_view(LoginAPIView, AsyncLoginAPIView), name='auth-login'), # noqa E501
     path('api/v1/auth/logout/', LogoutAPIView.as_view(), name='auth-logout'),
-    path("api/v1/auth/google/", GoogleAuthAPIView.as_view(), name="auth-google"), # noqa E501
+    path("api/v1/auth/google/", api_view(GoogleAuthAPIView, AsyncGoogleAuthAPIView), name="auth-google"), # noqa E501
 
     # REFRESH (SimpleJWT)
     path('api/v1/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'), # noqa E501
 
     # accounts
-    path("api/v1/admin/users/", UserListAPIView.as_view(), name="admin-user-list"), # noqa E501
-    path("api/v1/admin/users/<int:user_id>/", UserDetailAPIView.as_view(), name="admin-user-detail"), # noqa E501
-    path("api/v1/me/", MeAPIView.as_view(), name="me"),
+    path("api/v1/admin/users/", api_view(UserListAPIView, AsyncUserListAPIView), name="admin-user-list"), # noqa E501
+    path("api/v1/admin/users/export/", UserExportAPIView.as_view(), name="admin-user-export"), # noqa E501
+    path("api/v1/admin/users/import/", UserBulkImportAPIView.as_view(), name="admin-user-import"), # noqa E501
+    path("api/v1/admin/users/batch/", UserBatchAPIView.as_view(), name="admin-user-batch"), # noqa E501
+    path("api/v1/admin/users/<int:user_id>/", api_view(UserDetailAPIView, AsyncUserDetailAPIView), name="admin-user-detail"), # noqa E501
+    path("api/v1/me/", api_view(MeAPIView, AsyncMeAPIView), name="me"), # noqa E501
 ]
 
 if settings.DEBUG:
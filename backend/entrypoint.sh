@@ -9,6 +9,9 @@ done
 echo "Aplicando migrations..."
 python manage.py migrate --noinput
 
+echo "Gerando schema OpenAPI..."
+python manage.py build_openapi_schema || true
+
 echo "Coletando static..."
 python manage.py collectstatic --noinput || true
 
@@ -28,5 +31,18 @@ else:
     print('Superuser já existe ou env não definido.')
 " || true
 
-echo "Subindo servidor..."
-python manage.py runserver 0.0.0.0:8000
+echo "Subindo servidor (${SERVER:-runserver})..."
+case "${SERVER:-runserver}" in
+  uvicorn)
+    # ASGI: use junto com ASYNC_API_VIEWS=True
+    exec uvicorn core.asgi:application --host 0.0.0.0 --port 8000 \
+      --workers "${WEB_WORKERS:-2}"
+    ;;
+  gunicorn)
+    exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 \
+      --workers "${WEB_WORKERS:-2}" --threads "${WEB_THREADS:-4}"
+    ;;
+  *)
+    python manage.py runserver 0.0.0.0:8000
+    ;;
+esac